@@ -3,8 +3,9 @@ Authentication module for OVH Checker API.
 Provides JWT-based authentication with bcrypt password hashing.
 """
 import os
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 import hashlib
 import secrets
 
@@ -56,14 +57,14 @@ def create_access_token(user_id: int, email: str, is_admin: bool = False) -> str
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
-def create_refresh_token(user_id: int) -> Tuple[str, str, datetime]:
+def create_refresh_token(user_id: int) -> Tuple[str, bytes, datetime]:
     """
     Create a refresh token.
     Returns: (token, token_hash, expires_at)
     """
     token = secrets.token_urlsafe(64)
     # Use BLAKE2b with key for secure token hashing (faster and more secure than SHA)
-    token_hash = hashlib.blake2b(token.encode(), key=JWT_SECRET.encode()[:64], digest_size=32).hexdigest()
+    token_hash = hashlib.blake2b(token.encode(), key=JWT_SECRET.encode()[:64], digest_size=32).digest()
     expires_at = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     return token, token_hash, expires_at
 
@@ -79,9 +80,9 @@ def decode_token(token: str) -> Optional[dict]:
         return None
 
 
-def hash_refresh_token(token: str) -> str:
+def hash_refresh_token(token: str) -> bytes:
     """Hash a refresh token for storage using BLAKE2b."""
-    return hashlib.blake2b(token.encode(), key=JWT_SECRET.encode()[:64], digest_size=32).hexdigest()
+    return hashlib.blake2b(token.encode(), key=JWT_SECRET.encode()[:64], digest_size=32).digest()
 
 
 class AuthenticatedUser:
@@ -149,7 +150,7 @@ async def get_current_admin(
     return user
 
 
-def generate_api_key() -> Tuple[str, str]:
+def generate_api_key() -> Tuple[str, bytes]:
     """
     Generate an API key for programmatic access.
     Returns: (api_key, key_hash)
@@ -161,10 +162,47 @@ def generate_api_key() -> Tuple[str, str]:
     """
     api_key = f"ovh_{secrets.token_urlsafe(32)}"
     # lgtm[py/weak-sensitive-data-hashing] - API key, not password; high entropy token
-    key_hash = hashlib.blake2b(api_key.encode(), key=JWT_SECRET.encode()[:64], digest_size=32).hexdigest()
+    key_hash = hashlib.blake2b(api_key.encode(), key=JWT_SECRET.encode()[:64], digest_size=32).digest()
     return api_key, key_hash
 
 
+# Cache-aside for API-key validation. Keys are immutable apart from
+# revocation, so a short in-process TTL turns the per-request DB lookup
+# into a dict hit; revocation clears the cache so a revoked key stops
+# working immediately. Misses are cached too, so a bad key can't hammer
+# the database — but only briefly and within the size cap, since the
+# hash comes from an attacker-controlled unauthenticated header.
+API_KEY_CACHE_TTL_SECONDS = 300
+API_KEY_NEGATIVE_TTL_SECONDS = 30
+API_KEY_CACHE_MAX_ENTRIES = 1024
+# last_used_at is informational; writing it once a minute per key keeps
+# the hot path free of a per-request UPDATE
+API_KEY_LAST_USED_WRITE_SECONDS = 60
+
+_api_key_cache: Dict[bytes, Tuple[float, Optional[dict]]] = {}
+_api_key_last_used_written: Dict[bytes, float] = {}
+
+
+def _evict_api_key_cache(now: float) -> None:
+    """Keep the cache under its size cap: drop expired entries first,
+    then the oldest insertions (dicts preserve insertion order)."""
+    if len(_api_key_cache) < API_KEY_CACHE_MAX_ENTRIES:
+        return
+    for key in [k for k, (expires, _) in _api_key_cache.items() if expires <= now]:
+        del _api_key_cache[key]
+    while len(_api_key_cache) >= API_KEY_CACHE_MAX_ENTRIES:
+        del _api_key_cache[next(iter(_api_key_cache))]
+    # The write-throttle map only holds valid keys, but bound it the
+    # same way so revoked keys don't accumulate forever
+    while len(_api_key_last_used_written) >= API_KEY_CACHE_MAX_ENTRIES:
+        del _api_key_last_used_written[next(iter(_api_key_last_used_written))]
+
+
+def clear_api_key_cache() -> None:
+    """Drop cached API-key validations (called after a key is revoked)."""
+    _api_key_cache.clear()
+
+
 async def get_user_from_api_key(
     request: Request,
     db
@@ -176,15 +214,27 @@ async def get_user_from_api_key(
     api_key = request.headers.get("X-API-Key")
     if not api_key:
         return None
-    
+
     # lgtm[py/weak-sensitive-data-hashing] - API key lookup, not password; fast hash required
-    key_hash = hashlib.blake2b(api_key.encode(), key=JWT_SECRET.encode()[:64], digest_size=32).hexdigest()
-    user = await db.get_user_by_api_key(key_hash)
-    
+    key_hash = hashlib.blake2b(api_key.encode(), key=JWT_SECRET.encode()[:64], digest_size=32).digest()
+
+    now = time.monotonic()
+    cached = _api_key_cache.get(key_hash)
+    if cached and cached[0] > now:
+        user = cached[1]
+    else:
+        user = await db.get_user_by_api_key(key_hash)
+        _evict_api_key_cache(now)
+        ttl = API_KEY_CACHE_TTL_SECONDS if user else API_KEY_NEGATIVE_TTL_SECONDS
+        _api_key_cache[key_hash] = (now + ttl, user)
+
     if user:
-        # Update last used timestamp
-        await db.update_api_key_last_used(key_hash)
+        # Update last used timestamp, throttled per key
+        last_written = _api_key_last_used_written.get(key_hash, float('-inf'))
+        if now - last_written >= API_KEY_LAST_USED_WRITE_SECONDS:
+            _api_key_last_used_written[key_hash] = now
+            await db.update_api_key_last_used(key_hash)
         return AuthenticatedUser(user["id"], user["email"], user["is_admin"])
-    
+
     return None
 
@@ -9,7 +9,7 @@ import sys
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone, timedelta
 
-from sqlalchemy import select, update, delete, func, and_, or_, text, distinct
+from sqlalchemy import select, update, delete, func, and_, or_, text, distinct, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
@@ -27,6 +27,35 @@ from shared.models import (
 # Currency symbols for formatting
 CURRENCY_SYMBOLS = {'USD': '$', 'EUR': '€', 'GBP': '£', 'CAD': 'CA$', 'AUD': 'A$'}
 
+# Module-level statements for the per-request auth lookups, mirroring the
+# checker's pattern: built once so each call skips statement construction
+# and the stable SQL text stays hot in the compiled and asyncpg
+# prepared-statement caches.
+_GET_USER_BY_EMAIL_STMT = select(User).where(
+    func.lower(User.email) == bindparam('email')
+)
+
+_GET_USER_BY_ID_STMT = select(User).where(User.id == bindparam('user_id'))
+
+_GET_USER_BY_API_KEY_STMT = (
+    select(User)
+    .join(ApiKey, ApiKey.user_id == User.id)
+    .where(and_(
+        ApiKey.key_hash == bindparam('key_hash'),
+        ApiKey.revoked_at.is_(None),
+        or_(
+            ApiKey.expires_at.is_(None),
+            ApiKey.expires_at > func.now()
+        )
+    ))
+)
+
+_UPDATE_API_KEY_LAST_USED_STMT = (
+    update(ApiKey)
+    .where(ApiKey.key_hash == bindparam('key_hash'))
+    .values(last_used_at=func.now())
+)
+
 
 def format_price(price_microcents: int, currency: str = 'USD') -> str:
     """Convert microcents to formatted price string."""
@@ -72,6 +101,19 @@ class Database:
             max_overflow=20,
             pool_pre_ping=True,
             pool_recycle=3600,
+            # LIFO keeps bursty traffic on a small set of warm connections
+            # and lets overflow connections age out when idle
+            pool_use_lifo=True,
+            pool_timeout=5,
+            # Batch multi-row INSERTs into pages of 1000 rows
+            insertmanyvalues_page_size=1000,
+            connect_args={
+                # Keep the small set of hot auth/serializer queries as
+                # server-side prepared statements across requests
+                "prepared_statement_cache_size": 500,
+                # JIT never pays off for these short OLTP statements
+                "server_settings": {"jit": "off"},
+            },
         )
         
         self.session_factory = async_sessionmaker(
@@ -127,7 +169,7 @@ class Database:
         """Get user by email."""
         async with self._session() as session:
             result = await session.execute(
-                select(User).where(User.email == email.lower())
+                _GET_USER_BY_EMAIL_STMT, {'email': email.lower()}
             )
             user = result.scalar_one_or_none()
             if user:
@@ -148,7 +190,7 @@ class Database:
         """Get user by ID."""
         async with self._session() as session:
             result = await session.execute(
-                select(User).where(User.id == user_id)
+                _GET_USER_BY_ID_STMT, {'user_id': user_id}
             )
             user = result.scalar_one_or_none()
             if user:
@@ -205,7 +247,7 @@ class Database:
         """Check if email already exists."""
         async with self._session() as session:
             result = await session.execute(
-                select(User.id).where(User.email == email.lower()).limit(1)
+                select(User.id).where(func.lower(User.email) == email.lower()).limit(1)
             )
             return result.scalar_one_or_none() is not None
 
@@ -213,13 +255,13 @@ class Database:
         """Check if username already exists."""
         async with self._session() as session:
             result = await session.execute(
-                select(User.id).where(User.username == username).limit(1)
+                select(User.id).where(func.lower(User.username) == username.lower()).limit(1)
             )
             return result.scalar_one_or_none() is not None
 
     # ============ Refresh Tokens ============
 
-    async def save_refresh_token(self, user_id: int, token_hash: str, expires_at: datetime):
+    async def save_refresh_token(self, user_id: int, token_hash: bytes, expires_at: datetime):
         """Save a refresh token."""
         async with self._session() as session:
             token = RefreshToken(
@@ -230,7 +272,7 @@ class Database:
             session.add(token)
             await session.commit()
 
-    async def get_refresh_token(self, token_hash: str) -> Optional[Dict[str, Any]]:
+    async def get_refresh_token(self, token_hash: bytes) -> Optional[Dict[str, Any]]:
         """Get refresh token info."""
         async with self._session() as session:
             result = await session.execute(
@@ -252,7 +294,7 @@ class Database:
                 }
             return None
 
-    async def revoke_refresh_token(self, token_hash: str):
+    async def revoke_refresh_token(self, token_hash: bytes):
         """Revoke a refresh token."""
         async with self._session() as session:
             await session.execute(
@@ -288,7 +330,7 @@ class Database:
     async def create_api_key(
         self, 
         user_id: int, 
-        key_hash: str, 
+        key_hash: bytes,
         name: str,
         expires_at: Optional[datetime] = None
     ) -> int:
@@ -327,20 +369,11 @@ class Database:
                 for key in result.scalars().all()
             ]
 
-    async def get_user_by_api_key(self, key_hash: str) -> Optional[Dict[str, Any]]:
+    async def get_user_by_api_key(self, key_hash: bytes) -> Optional[Dict[str, Any]]:
         """Get user by API key hash."""
         async with self._session() as session:
             result = await session.execute(
-                select(User)
-                .join(ApiKey, ApiKey.user_id == User.id)
-                .where(and_(
-                    ApiKey.key_hash == key_hash,
-                    ApiKey.revoked_at.is_(None),
-                    or_(
-                        ApiKey.expires_at.is_(None),
-                        ApiKey.expires_at > func.now()
-                    )
-                ))
+                _GET_USER_BY_API_KEY_STMT, {'key_hash': key_hash}
             )
             user = result.scalar_one_or_none()
             if user:
@@ -352,13 +385,11 @@ class Database:
                 }
             return None
 
-    async def update_api_key_last_used(self, key_hash: str):
+    async def update_api_key_last_used(self, key_hash: bytes):
         """Update API key last used timestamp."""
         async with self._session() as session:
             await session.execute(
-                update(ApiKey)
-                .where(ApiKey.key_hash == key_hash)
-                .values(last_used_at=func.now())
+                _UPDATE_API_KEY_LAST_USED_STMT, {'key_hash': key_hash}
             )
             await session.commit()
 
@@ -387,7 +418,9 @@ class Database:
         include_specs: bool = True,
         mention_role_id: Optional[str] = None,
         embed_color: Optional[str] = None,
-        slack_channel: Optional[str] = None
+        slack_channel: Optional[str] = None,
+        validated_at: Optional[datetime] = None,
+        resolved_ip: Optional[str] = None
     ) -> int:
         """Create a user webhook with customization options (Discord or Slack)."""
         async with self._session() as session:
@@ -402,7 +435,9 @@ class Database:
                 include_specs=include_specs,
                 mention_role_id=mention_role_id,
                 embed_color=embed_color,
-                slack_channel=slack_channel
+                slack_channel=slack_channel,
+                validated_at=validated_at,
+                resolved_ip=resolved_ip
             )
             session.add(webhook)
             await session.commit()
@@ -931,14 +966,14 @@ class Database:
         """Get the latest status for each plan/datacenter combination, grouped by plan."""
         async with self._session() as session:
             # Use raw SQL for the complex CTE query - SQLAlchemy can handle it but this is clearer
+            # current_inventory holds one row per plan/subsidiary/datacenter,
+            # so no DISTINCT ON over the history table is needed
             base_query = """
                 WITH latest AS (
-                    SELECT DISTINCT ON (plan_code, subsidiary, datacenter) 
-                        id, plan_code, subsidiary, datacenter, datacenter_code, is_available, 
-                        linux_status, checked_at
-                    FROM inventory_status
+                    SELECT plan_code, subsidiary, datacenter, datacenter_code,
+                        is_available, linux_status, checked_at
+                    FROM current_inventory
                     {where_clause}
-                    ORDER BY plan_code, subsidiary, datacenter, checked_at DESC
                 )
                 SELECT 
                     l.*,
@@ -1189,36 +1224,39 @@ class Database:
     async def admin_get_user_details(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get detailed user info including webhooks and subscriptions (admin only)."""
         async with self._session() as session:
-            user_result = await session.execute(
-                select(User).where(User.id == user_id)
+            # One round trip: the counts ride along as scalar subqueries
+            # instead of two follow-up queries
+            webhook_count = (
+                select(func.count())
+                .select_from(UserWebhook)
+                .where(UserWebhook.user_id == user_id)
+                .scalar_subquery()
             )
-            user = user_result.scalar_one_or_none()
-            if not user:
+            subscription_count = (
+                select(func.count())
+                .select_from(UserPlanSubscription)
+                .where(UserPlanSubscription.user_id == user_id)
+                .scalar_subquery()
+            )
+            result = await session.execute(
+                select(User, webhook_count, subscription_count).where(User.id == user_id)
+            )
+            row = result.first()
+            if not row:
                 return None
-            
-            result = {
+
+            user = row[0]
+            return {
                 'id': user.id,
                 'email': user.email,
                 'username': user.username,
                 'is_active': user.is_active,
                 'is_admin': user.is_admin,
                 'created_at': user.created_at,
-                'last_login': user.last_login_at
+                'last_login': user.last_login_at,
+                'webhook_count': row[1],
+                'subscription_count': row[2]
             }
-            
-            # Get webhook count
-            webhook_result = await session.execute(
-                select(func.count()).select_from(UserWebhook).where(UserWebhook.user_id == user_id)
-            )
-            result['webhook_count'] = webhook_result.scalar()
-            
-            # Get subscription count
-            sub_result = await session.execute(
-                select(func.count()).select_from(UserPlanSubscription).where(UserPlanSubscription.user_id == user_id)
-            )
-            result['subscription_count'] = sub_result.scalar()
-            
-            return result
 
     async def admin_create_user(
         self,
@@ -3,7 +3,10 @@ Webhook notification client for API.
 Supports Discord and Slack webhooks.
 """
 import aiohttp
+import asyncio
+import ipaddress
 import logging
+import socket
 from typing import Optional, Tuple
 from datetime import datetime, timezone
 from urllib.parse import urlparse
@@ -15,6 +18,50 @@ DISCORD_HOSTS = ('discord.com', 'discordapp.com')
 SLACK_HOSTS = ('hooks.slack.com',)
 
 
+def _is_private_ip(ip_str: str) -> bool:
+    """Check if an IP address is private, loopback, or otherwise internal."""
+    try:
+        ip = ipaddress.ip_address(ip_str)
+        return not ip.is_global
+    except ValueError:
+        # Not a valid IP at all — reject it
+        return True
+
+
+async def resolve_and_validate_webhook_url(url: str) -> Tuple[bool, str, Optional[str]]:
+    """
+    Resolve a webhook URL's hostname and verify it points at a public IP.
+
+    Run once at webhook registration; the result (timestamp + resolved IP)
+    is persisted on the webhook row so the notification hot path never has
+    to repeat the DNS + SSRF check. Returns (is_safe, error_message,
+    resolved_ip).
+    """
+    hostname = urlparse(url).hostname
+    if not hostname:
+        return False, "Invalid webhook URL: no hostname", None
+
+    try:
+        results = await asyncio.get_running_loop().getaddrinfo(
+            hostname, None,
+            family=socket.AF_UNSPEC,
+            type=socket.SOCK_STREAM,
+        )
+    except socket.gaierror as e:
+        return False, f"Failed to resolve webhook hostname: {e}", None
+
+    resolved_ip = None
+    for _family, _type, _proto, _canon, sockaddr in results:
+        ip_str = sockaddr[0]
+        if _is_private_ip(ip_str):
+            return False, f"Webhook URL resolves to private/internal IP: {ip_str}", None
+        if resolved_ip is None:
+            resolved_ip = ip_str
+    if resolved_ip is None:
+        return False, "Webhook hostname did not resolve to any address", None
+    return True, "", resolved_ip
+
+
 def detect_webhook_type(url: str) -> str:
     """Detect webhook type from URL using proper URL parsing."""
     if not url:
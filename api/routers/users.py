@@ -106,18 +106,24 @@ async def create_my_webhook(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Create a new webhook (Discord or Slack) for current user with customization options."""
-    from discord_client import detect_webhook_type
-    
+    from discord_client import detect_webhook_type, resolve_and_validate_webhook_url
+
     # Auto-detect webhook type if not provided
     webhook_type = webhook.webhook_type
     if not webhook_type:
         webhook_type = detect_webhook_type(webhook.webhook_url)
         if webhook_type == 'unknown':
             raise HTTPException(status_code=400, detail="Could not detect webhook type. Use a Discord or Slack webhook URL.")
-    
+
+    # SSRF check happens once here at registration; the checker's send
+    # path relies on the stored result instead of re-resolving per alert
+    is_safe, error_msg, resolved_ip = await resolve_and_validate_webhook_url(webhook.webhook_url)
+    if not is_safe:
+        raise HTTPException(status_code=400, detail=f"Invalid webhook URL: {error_msg}")
+
     webhook_id = await db.create_user_webhook(
-        user_id=user.user_id, 
-        webhook_url=webhook.webhook_url, 
+        user_id=user.user_id,
+        webhook_url=webhook.webhook_url,
         webhook_name=webhook.webhook_name,
         webhook_type=webhook_type,
         bot_username=webhook.bot_username,
@@ -126,7 +132,9 @@ async def create_my_webhook(
         include_specs=webhook.include_specs,
         mention_role_id=webhook.mention_role_id,
         embed_color=webhook.embed_color,
-        slack_channel=webhook.slack_channel
+        slack_channel=webhook.slack_channel,
+        validated_at=datetime.now(timezone.utc),
+        resolved_ip=resolved_ip
     )
     return await db.get_user_webhook(user.user_id, webhook_id)
 
@@ -321,9 +329,14 @@ async def revoke_api_key(
     user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Revoke an API key."""
+    from auth import clear_api_key_cache
+
     success = await db.revoke_api_key(user.user_id, key_id)
     if not success:
         raise HTTPException(status_code=404, detail="API key not found")
+    # Drop cached validations so the revoked key stops working now,
+    # not when its cache TTL expires
+    clear_api_key_cache()
     return {"status": "ok"}
 
 
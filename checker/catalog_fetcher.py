@@ -15,11 +15,12 @@ This API provides:
 - Available datacenters per plan
 """
 
-import aiohttp
 import logging
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
+from http_client import get_session, json_loads
+
 logger = logging.getLogger(__name__)
 
 # Subsidiary to base URL mapping
@@ -67,6 +68,29 @@ SUBSIDIARY_WEBSITE_URLS = {
 
 DEFAULT_SUBSIDIARY = 'US'
 
+# Human-readable subsidiary names
+SUBSIDIARY_NAMES = {
+    'US': 'OVHcloud US',
+    'CA': 'OVHcloud Canada',
+    'FR': 'OVHcloud France',
+    'DE': 'OVHcloud Germany',
+    'ES': 'OVHcloud Spain',
+    'IT': 'OVHcloud Italy',
+    'NL': 'OVHcloud Netherlands',
+    'PL': 'OVHcloud Poland',
+    'PT': 'OVHcloud Portugal',
+    'GB': 'OVHcloud UK',
+    'IE': 'OVHcloud Ireland',
+    'SG': 'OVHcloud Singapore',
+    'AU': 'OVHcloud Australia',
+    'IN': 'OVHcloud India',
+    'WS': 'OVHcloud International',
+}
+
+# Purchase page URLs, precomputed once at import since they sit on the
+# notification hot path
+_PURCHASE_URLS = {sub: f"{base}/vps/" for sub, base in SUBSIDIARY_WEBSITE_URLS.items()}
+
 # Comprehensive datacenter code to location mapping
 # Maps lowercase datacenter codes to display names, cities, and countries
 DATACENTER_LOCATIONS = {
@@ -132,29 +156,12 @@ def get_datacenter_api_base(subsidiary: str) -> str:
 
 def get_purchase_url(subsidiary: str) -> str:
     """Get the VPS purchase page URL for a subsidiary."""
-    base = SUBSIDIARY_WEBSITE_URLS.get(subsidiary.upper(), SUBSIDIARY_WEBSITE_URLS.get('US'))
-    return f"{base}/vps/"
+    return _PURCHASE_URLS.get(subsidiary.upper(), _PURCHASE_URLS['US'])
 
 def get_subsidiary_name(subsidiary: str) -> str:
     """Get a human-readable name for a subsidiary."""
-    names = {
-        'US': 'OVHcloud US',
-        'CA': 'OVHcloud Canada',
-        'FR': 'OVHcloud France',
-        'DE': 'OVHcloud Germany',
-        'ES': 'OVHcloud Spain',
-        'IT': 'OVHcloud Italy',
-        'NL': 'OVHcloud Netherlands',
-        'PL': 'OVHcloud Poland',
-        'PT': 'OVHcloud Portugal',
-        'GB': 'OVHcloud UK',
-        'IE': 'OVHcloud Ireland',
-        'SG': 'OVHcloud Singapore',
-        'AU': 'OVHcloud Australia',
-        'IN': 'OVHcloud India',
-        'WS': 'OVHcloud International',
-    }
-    return names.get(subsidiary.upper(), f'OVHcloud {subsidiary.upper()}')
+    sub = subsidiary.upper()
+    return SUBSIDIARY_NAMES.get(sub, f'OVHcloud {sub}')
 
 
 @dataclass
@@ -201,15 +208,14 @@ class CatalogFetcher:
             catalog_url = get_catalog_url(self.subsidiary)
             logger.info(f"Fetching catalog for subsidiary {self.subsidiary}: {catalog_url}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(catalog_url, timeout=60) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        logger.info(f"Fetched catalog with {len(data.get('plans', []))} plans")
-                        return data
-                    else:
-                        logger.error(f"Failed to fetch catalog: HTTP {response.status}")
-                        return None
+            async with get_session().get(catalog_url) as response:
+                if response.status == 200:
+                    data = json_loads(await response.read())
+                    logger.info(f"Fetched catalog with {len(data.get('plans', []))} plans")
+                    return data
+                else:
+                    logger.error(f"Failed to fetch catalog: HTTP {response.status}")
+                    return None
         except Exception as e:
             logger.error(f"Error fetching catalog: {e}")
             return None
@@ -278,21 +284,20 @@ class CatalogFetcher:
             storage = tech.get('storage', {}).get('disks', [{}])[0] if tech.get('storage', {}).get('disks') else {}
             bandwidth = tech.get('bandwidth', {})
             
-            # Extract datacenters from plan configurations
-            datacenters = []
-            for config in plan.get('configurations', []):
-                if config.get('name') == 'vps_datacenter':
-                    datacenters = config.get('values', [])
-                    break
-            
+            # Extract datacenters from plan configurations (indexed by name for O(1) lookup)
+            plan_configs = {c.get('name'): c for c in plan.get('configurations', ())}
+            dc_config = plan_configs.get('vps_datacenter')
+            datacenters = dc_config.get('values', []) if dc_config else []
+
             # Also check meta configurations
             if not datacenters:
-                for config in meta.get('configurations', []):
-                    if config.get('name') == 'vps_datacenter':
-                        for val in config.get('values', []):
-                            dc = val.get('value', '') if isinstance(val, dict) else val
-                            if dc:
-                                datacenters.append(dc)
+                meta_configs = {c.get('name'): c for c in meta.get('configurations', ())}
+                meta_dc_config = meta_configs.get('vps_datacenter')
+                if meta_dc_config:
+                    for val in meta_dc_config.get('values', []):
+                        dc = val.get('value', '') if isinstance(val, dict) else val
+                        if dc:
+                            datacenters.append(dc)
             
             # Determine storage type - LZ plans use NAS, not local NVMe
             if '.LZ' in plan_code:
@@ -429,17 +434,16 @@ class CatalogFetcher:
         """
         url = self.get_availability_url(plan_code)
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=30) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        mapping = {}
-                        for dc in data.get('datacenters', []):
-                            dc_name = dc.get('datacenter', '')
-                            dc_code = dc.get('code', '')
-                            if dc_name and dc_code:
-                                mapping[dc_name] = dc_code
-                        return mapping
+            async with get_session().get(url) as response:
+                if response.status == 200:
+                    data = json_loads(await response.read())
+                    mapping = {}
+                    for dc in data.get('datacenters', []):
+                        dc_name = dc.get('datacenter', '')
+                        dc_code = dc.get('code', '')
+                        if dc_name and dc_code:
+                            mapping[dc_name] = dc_code
+                    return mapping
         except Exception as e:
             logger.error(f"Error fetching datacenter code mapping: {e}")
         return {}
@@ -484,15 +488,12 @@ class CatalogFetcher:
         
         logger.info(f"Got {len(dc_code_mapping)} datacenter code mappings from {len(sample_plans)} sample plans")
         
-        # Sync to database
-        plans_added = 0
-        plans_updated = 0
-        pricing_updated = 0
-        locations_synced = 0
-        
+        # Sync to database in bulk - one statement per table instead of one
+        # transaction per plan/pricing/location row
+        plan_rows = []
         for spec in specs:
             url = self.get_availability_url(spec.plan_code)
-            
+
             # Determine display name - check LZ first since it can have -eu suffix
             display_name = spec.invoice_name
             if '.LZ' in spec.plan_code:
@@ -506,72 +507,76 @@ class CatalogFetcher:
                 display_name += ' (EU)'
             elif spec.plan_code.endswith('-ca'):
                 display_name += ' (Canada)'
-            
-            # Upsert plan with visibility info
+
             visibility_tags_str = ','.join(spec.visibility_tags) if spec.visibility_tags else None
-            result = await self.db.upsert_plan(
-                plan_code=spec.plan_code,
-                subsidiary=self.subsidiary,
-                display_name=display_name,
-                url=url,
-                purchase_url=purchase_url,
-                vcpu=spec.vcpu,
-                ram_gb=spec.ram_gb,
-                storage_gb=spec.storage_gb,
-                storage_type=spec.storage_type,
-                bandwidth_mbps=spec.bandwidth_mbps,
-                description=spec.description,
-                is_orderable=spec.is_orderable,
-                visibility_tags=visibility_tags_str,
-                product_line=spec.product_line
-            )
-            if result == 'added':
-                plans_added += 1
-            elif result == 'updated':
-                plans_updated += 1
-        
+            plan_rows.append({
+                'plan_code': spec.plan_code,
+                'subsidiary': self.subsidiary,
+                'display_name': display_name,
+                'url': url,
+                'purchase_url': purchase_url,
+                'vcpu': spec.vcpu,
+                'ram_gb': spec.ram_gb,
+                'storage_gb': spec.storage_gb,
+                'storage_type': spec.storage_type,
+                'bandwidth_mbps': spec.bandwidth_mbps,
+                'description': spec.description,
+                'is_orderable': spec.is_orderable,
+                'visibility_tags': visibility_tags_str,
+                'product_line': spec.product_line,
+                'enabled': True,
+                'catalog_status': 'new'
+            })
+
+        plan_counts = await self.db.upsert_plans_bulk(plan_rows)
+        plans_added = plan_counts['added']
+        plans_updated = plan_counts['updated']
+
         # Sync pricing
-        for p in pricing:
-            await self.db.save_pricing(
-                plan_code=p.plan_code,
-                subsidiary=self.subsidiary,
-                commitment_months=p.commitment_months,
-                price_microcents=p.price_microcents,
-                description=p.description,
-                currency=p.currency
-            )
-            pricing_updated += 1
-        
+        pricing_rows = [
+            {
+                'plan_code': p.plan_code,
+                'subsidiary': self.subsidiary,
+                'commitment_months': p.commitment_months,
+                'price_microcents': p.price_microcents,
+                'description': p.description,
+                'currency': p.currency
+            }
+            for p in pricing
+        ]
+        pricing_updated = await self.db.save_pricing_bulk(pricing_rows)
+
         # Sync datacenter locations using the code mapping
+        location_rows = []
         for dc_name, loc_info in datacenter_locations.items():
             dc_code = dc_code_mapping.get(dc_name)
             if dc_code:
                 # Use our comprehensive mapping for accurate location data
                 known_location = get_datacenter_location(dc_code)
-                await self.db.upsert_datacenter_location(
-                    datacenter_code=dc_code,
-                    subsidiary=self.subsidiary,
-                    display_name=known_location['display_name'],
-                    city=known_location['city'],
-                    country=known_location['country'],
-                    country_code=known_location['country_code'],
-                    flag=known_location['flag'],
-                    region=known_location['region']
-                )
-                locations_synced += 1
+                location_rows.append({
+                    'datacenter_code': dc_code,
+                    'subsidiary': self.subsidiary,
+                    'display_name': known_location['display_name'],
+                    'city': known_location['city'],
+                    'country': known_location['country'],
+                    'country_code': known_location['country_code'],
+                    'flag': known_location['flag'],
+                    'region': known_location['region']
+                })
             else:
                 logger.warning(f"No code mapping found for datacenter: {dc_name}")
+
+        locations_synced = await self.db.upsert_datacenter_locations_bulk(location_rows)
         
         # Mark plans not in current catalog as discontinued for this subsidiary
+        # and age 'new' plans to 'active', in one transaction
         active_plan_codes = [s.plan_code for s in specs]
-        plans_discontinued = await self.db.mark_plans_discontinued(active_plan_codes, self.subsidiary)
+        lifecycle = await self.db.finalize_catalog_sync({self.subsidiary: active_plan_codes})
+        plans_discontinued = lifecycle['discontinued']
         if plans_discontinued > 0:
             logger.info(f"Marked {plans_discontinued} plans as discontinued for {self.subsidiary}")
-        
-        # Mark new plans as active after initial discovery period
-        plans_activated = await self.db.mark_new_plans_active()
-        if plans_activated > 0:
-            logger.info(f"Marked {plans_activated} new plans as active")
+        if lifecycle['activated'] > 0:
+            logger.info(f"Marked {lifecycle['activated']} new plans as active")
         
         # Update last sync time for this subsidiary
         from datetime import datetime, timezone
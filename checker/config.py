@@ -18,6 +18,8 @@ class Settings(BaseSettings):
     database_url: str = _get_database_url()
     check_interval_seconds: int = int(os.getenv("CHECK_INTERVAL_SECONDS", "120"))
     notification_threshold_minutes: int = int(os.getenv("NOTIFICATION_THRESHOLD_MINUTES", "60"))
+    # How many plans are checked against the OVH API concurrently
+    plan_concurrency: int = int(os.getenv("PLAN_CONCURRENCY", "8"))
     
     # Distributed mode: Set SUBSIDIARY to run a single-subsidiary checker agent
     # If not set, runs in multi-subsidiary mode (legacy behavior)
@@ -4,12 +4,21 @@ SQLAlchemy-based Database Layer for OVH Checker Service
 This module provides an async database interface using SQLAlchemy 2.0 ORM.
 """
 
+import asyncio
+import json
+import logging
 import os
 import sys
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
-from sqlalchemy import select, update, delete, func, and_, or_, text
+from sqlalchemy import (
+    select, update, delete, func, and_, or_, text, literal_column,
+    column, tuple_, values as sa_values, String, bindparam, case
+)
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
@@ -18,20 +27,81 @@ from sqlalchemy.exc import IntegrityError
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from shared.models import (
     Base, Config, User, MonitoredPlan, PlanPricing, DatacenterLocation,
-    InventoryStatus, OutOfStockTracking, NotificationHistory,
+    InventoryStatus, CurrentInventory, OutOfStockTracking, NotificationHistory,
     UserPlanSubscription, UserWebhook, UserNotificationHistory
 )
 
 
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_dumps = json.dumps
+
+
 # Currency symbols for formatting
 CURRENCY_SYMBOLS = {'USD': '$', 'EUR': '€', 'GBP': '£', 'CAD': 'CA$', 'AUD': 'A$'}
 
 
+@lru_cache(maxsize=32)
+def _currency_prefix(currency: str) -> str:
+    """Pre-baked price prefix for a currency code."""
+    return CURRENCY_SYMBOLS.get(currency, currency + ' ')
+
+
 def format_price(price_microcents: int, currency: str = 'USD') -> str:
     """Convert microcents to formatted price string."""
-    dollars = price_microcents / 100_000_000
-    symbol = CURRENCY_SYMBOLS.get(currency, currency + ' ')
-    return f"{symbol}{dollars:.2f}/mo"
+    # Integer path: avoids float division/rounding on a per-row hot helper
+    dollars, remainder = divmod(price_microcents, 100_000_000)
+    cents = remainder // 1_000_000
+    return f"{_currency_prefix(currency)}{dollars}.{cents:02d}/mo"
+
+
+# Module-level statements for the highest-frequency single-row lookups.
+# Building them once avoids per-call construction overhead and keeps the SQL
+# text stable so asyncpg's server-side prepared-statement cache gets hits.
+_GET_CONFIG_STMT = select(Config.value).where(Config.key == bindparam('key'))
+
+_GET_LAST_STATUS_STMT = (
+    select(CurrentInventory.is_available, CurrentInventory.linux_status, CurrentInventory.checked_at)
+    .where(and_(
+        CurrentInventory.plan_code == bindparam('plan_code'),
+        CurrentInventory.datacenter == bindparam('datacenter'),
+        CurrentInventory.subsidiary == bindparam('subsidiary')
+    ))
+)
+
+_OUT_OF_STOCK_DURATION_STMT = (
+    select(
+        (func.extract('epoch', func.now() - OutOfStockTracking.out_of_stock_since) / 60)
+        .label('minutes')
+    )
+    .where(and_(
+        OutOfStockTracking.plan_code == bindparam('plan_code'),
+        OutOfStockTracking.datacenter == bindparam('datacenter'),
+        OutOfStockTracking.subsidiary == bindparam('subsidiary'),
+        OutOfStockTracking.returned_to_stock_at.is_(None)
+    ))
+)
+
+_IN_STOCK_DURATION_STMT = (
+    select(
+        (func.extract('epoch', func.now() - OutOfStockTracking.returned_to_stock_at) / 60)
+        .label('minutes')
+    )
+    .where(and_(
+        OutOfStockTracking.plan_code == bindparam('plan_code'),
+        OutOfStockTracking.datacenter == bindparam('datacenter'),
+        OutOfStockTracking.subsidiary == bindparam('subsidiary'),
+        OutOfStockTracking.returned_to_stock_at.isnot(None)
+    ))
+    .order_by(OutOfStockTracking.returned_to_stock_at.desc())
+    .limit(1)
+)
 
 
 class Database:
@@ -40,8 +110,48 @@ class Database:
     
     This class provides the same public API as the old asyncpg-based implementation
     but uses SQLAlchemy ORM for all database operations.
+
+    History writes (inventory status, notification history) are buffered
+    in-process and flushed in batches via asyncpg COPY, so the hot status-check
+    path pays one transaction per batch instead of one per row.
     """
-    
+
+    # Buffered writes flush when a buffer reaches FLUSH_BATCH_SIZE rows or on
+    # the periodic FLUSH_INTERVAL_SECONDS timer, whichever comes first.
+    # Batches that fail to flush are re-queued and retried on the next
+    # flush, dropping the oldest rows only once a buffer hits MAX_BUFFERED_ROWS
+    # (a prolonged outage must not grow memory without bound).
+    FLUSH_INTERVAL_SECONDS = 0.5
+    FLUSH_BATCH_SIZE = 500
+    MAX_BUFFERED_ROWS = 5000
+
+    # Config rows are tiny and rarely change; cache them in-process so the
+    # notification and sync paths don't re-SELECT them on every event.
+    CONFIG_CACHE_TTL_SECONDS = 60
+
+    # Subscriptions change rarely but a hot restock fires the fanout join
+    # for the same plan many times in seconds; cache the resolved targets
+    # briefly so the storm costs one query per plan per window.
+    SUBSCRIBER_CACHE_TTL_SECONDS = 30
+
+    # Connections opened eagerly at connect() so the first check cycle does
+    # not pay TLS+auth latency on every lazily created pool connection
+    POOL_WARM_CONNECTIONS = 5
+
+    # Column order for buffered COPY records, per table. Timestamp columns are
+    # omitted so their server defaults apply.
+    _INVENTORY_COLUMNS = (
+        'plan_code', 'subsidiary', 'datacenter', 'datacenter_code',
+        'is_available', 'linux_status', 'raw_response'
+    )
+    _NOTIFICATION_COLUMNS = (
+        'plan_code', 'subsidiary', 'datacenter', 'message', 'success', 'error_message'
+    )
+    _USER_NOTIFICATION_COLUMNS = (
+        'user_id', 'webhook_id', 'plan_code', 'datacenter',
+        'message', 'success', 'error_message', 'is_default_webhook'
+    )
+
     def __init__(self, database_url: str):
         """
         Initialize database with connection URL.
@@ -56,6 +166,20 @@ class Database:
         self.database_url = database_url
         self.engine = None
         self.session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+        self._write_buffers: Dict[str, List[tuple]] = {
+            'inventory_status': [],
+            'notification_history': [],
+            'user_notification_history': [],
+        }
+        self._flush_task: Optional[asyncio.Task] = None
+        # Pending current_inventory upserts keyed by PK so only the newest
+        # state within a flush window is written
+        self._current_inventory_buffer: Dict[tuple, Dict[str, Any]] = {}
+        # (plan_code, subsidiary) pairs whose check completed without new
+        # state (e.g. a 304), batched into a checked_at-only UPDATE
+        self._current_inventory_touch: set = set()
+        self._config_cache: Dict[str, tuple] = {}  # key -> (value, expires_at)
+        self._subscriber_cache: Dict[tuple, tuple] = {}  # (plan, sub) -> (rows, expires_at)
 
     async def connect(self):
         """Create database engine and session factory."""
@@ -66,6 +190,26 @@ class Database:
             max_overflow=20,
             pool_pre_ping=True,
             pool_recycle=3600,
+            # LIFO keeps the checker's bursty workload on a small set of warm
+            # connections and lets overflow connections age out when idle
+            pool_use_lifo=True,
+            pool_timeout=30,
+            # orjson serializes the raw_response payloads ~5-10x faster than
+            # stdlib json on the write-heavy status path
+            json_serializer=_json_dumps,
+            # Batch multi-row INSERTs (bulk plan upserts) into pages of 1000
+            insertmanyvalues_page_size=1000,
+            connect_args={
+                # The checker replays the same handful of statements every
+                # poll cycle; keep them prepared server-side
+                "prepared_statement_cache_size": 500,
+                "server_settings": {
+                    # JIT compilation stalls asyncpg's type introspection queries
+                    "jit": "off",
+                    # Keep long-idle connections alive through NAT/K8s proxies
+                    "tcp_keepalives_idle": "30",
+                }
+            },
         )
         
         self.session_factory = async_sessionmaker(
@@ -75,8 +219,37 @@ class Database:
             autoflush=False,
         )
 
+        await self._warm_pool()
+
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _warm_pool(self):
+        """Pre-create a few pool connections; they stay checked in afterwards."""
+        async def ping():
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        try:
+            await asyncio.gather(*(ping() for _ in range(self.POOL_WARM_CONNECTIONS)))
+        except Exception as e:
+            # Warmup is best-effort; lazy connection creation still works
+            logger.warning(f"Pool warmup failed: {e}")
+
     async def disconnect(self):
-        """Close database connections."""
+        """Close database connections, flushing any buffered writes."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self._flush_buffers()
+        if any(self._write_buffers.values()) or self._current_inventory_buffer:
+            # The final flush failed and re-queued its rows; give a
+            # transient blip one chance to clear before the tail is lost
+            await asyncio.sleep(1.0)
+            await self._flush_buffers()
         if self.engine:
             await self.engine.dispose()
 
@@ -84,18 +257,164 @@ class Database:
         """Create a new session."""
         return self.session_factory()
 
+    @asynccontextmanager
+    async def transaction(self):
+        """Yield a session whose transaction spans the caller's scope.
+
+        Methods that accept an optional `session` argument can be called with
+        it to batch several reads/writes into one BEGIN/COMMIT instead of
+        paying a pool checkout and transaction per Database call.
+        """
+        async with self._session() as session:
+            async with session.begin():
+                yield session
+
+    # ============ Buffered Writes ============
+
+    async def _buffer_row(self, table: str, row: tuple):
+        """Queue a row for batched COPY; flush early if the buffer is full."""
+        buffer = self._write_buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.FLUSH_BATCH_SIZE:
+            await self._flush_buffers()
+
+    async def _flush_loop(self):
+        """Background task that periodically flushes buffered writes."""
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL_SECONDS)
+            try:
+                await self._flush_buffers()
+            except Exception as e:
+                logger.error(f"Error flushing write buffers: {e}")
+
+    async def _flush_buffers(self):
+        """Flush all non-empty write buffers via asyncpg COPY, one batch per table."""
+        for table, columns in (
+            ('inventory_status', self._INVENTORY_COLUMNS),
+            ('notification_history', self._NOTIFICATION_COLUMNS),
+            ('user_notification_history', self._USER_NOTIFICATION_COLUMNS),
+        ):
+            buffer = self._write_buffers[table]
+            if not buffer:
+                continue
+            rows, self._write_buffers[table] = buffer, []
+            try:
+                async with self.engine.begin() as conn:
+                    raw = await conn.get_raw_connection()
+                    await raw.driver_connection.copy_records_to_table(
+                        table, records=rows, columns=list(columns)
+                    )
+            except Exception as e:
+                # Re-queue ahead of anything buffered since the pop so a
+                # transient error doesn't discard the batch; keep the
+                # newest rows if the cap forces a drop
+                requeued = rows + self._write_buffers[table]
+                dropped = max(0, len(requeued) - self.MAX_BUFFERED_ROWS)
+                self._write_buffers[table] = requeued[dropped:]
+                logger.error(
+                    f"Failed to flush {len(rows)} rows to {table}, "
+                    f"re-queued for retry ({dropped} dropped at cap): {e}"
+                )
+
+        if self._current_inventory_buffer:
+            pending, self._current_inventory_buffer = self._current_inventory_buffer, {}
+            try:
+                await self._upsert_current_inventory(list(pending.values()))
+            except Exception as e:
+                # Merge back for retry; states buffered since the pop are
+                # newer and win. Bounded by the number of plan/datacenter
+                # combos, so no cap is needed.
+                pending.update(self._current_inventory_buffer)
+                self._current_inventory_buffer = pending
+                logger.error(
+                    f"Failed to upsert {len(pending)} current_inventory rows, "
+                    f"re-queued for retry: {e}"
+                )
+
+        if self._current_inventory_touch:
+            touched, self._current_inventory_touch = self._current_inventory_touch, set()
+            try:
+                async with self._session() as session:
+                    await session.execute(
+                        update(CurrentInventory)
+                        .where(tuple_(
+                            CurrentInventory.plan_code, CurrentInventory.subsidiary
+                        ).in_(list(touched)))
+                        .values(checked_at=func.now())
+                    )
+                    await session.commit()
+            except Exception as e:
+                self._current_inventory_touch.update(touched)
+                logger.error(
+                    f"Failed to touch checked_at for {len(touched)} plans, "
+                    f"re-queued for retry: {e}"
+                )
+
+    async def _upsert_current_inventory(self, rows: List[Dict[str, Any]]):
+        """Batch-upsert the latest state; last_changed_at only moves on flips."""
+        stmt = pg_insert(CurrentInventory).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['plan_code', 'subsidiary', 'datacenter'],
+            set_={
+                'datacenter_code': stmt.excluded.datacenter_code,
+                'is_available': stmt.excluded.is_available,
+                'linux_status': stmt.excluded.linux_status,
+                'checked_at': func.now(),
+                'last_changed_at': case(
+                    (CurrentInventory.is_available != stmt.excluded.is_available, func.now()),
+                    else_=CurrentInventory.last_changed_at
+                ),
+            }
+        )
+        async with self._session() as session:
+            await session.execute(stmt)
+            await session.commit()
+
     # ============ Config ============
 
     async def get_config(self, key: str) -> Optional[str]:
-        """Get a configuration value."""
+        """Get a configuration value (cached in-process with a short TTL)."""
+        cached = self._config_cache.get(key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
         async with self._session() as session:
-            result = await session.execute(
-                select(Config.value).where(Config.key == key)
-            )
-            return result.scalar_one_or_none()
+            result = await session.execute(_GET_CONFIG_STMT, {'key': key})
+            value = result.scalar_one_or_none()
+
+        self._config_cache[key] = (value, time.monotonic() + self.CONFIG_CACHE_TTL_SECONDS)
+        return value
+
+    async def get_configs(self, keys: List[str]) -> Dict[str, Optional[str]]:
+        """Get multiple configuration values in one round trip (cache-aware)."""
+        now = time.monotonic()
+        values: Dict[str, Optional[str]] = {}
+        missing = []
+        for key in keys:
+            cached = self._config_cache.get(key)
+            if cached and cached[1] > now:
+                values[key] = cached[0]
+            else:
+                missing.append(key)
+
+        if missing:
+            async with self._session() as session:
+                result = await session.execute(
+                    select(Config.key, Config.value).where(Config.key.in_(missing))
+                )
+                fetched = dict(result.all())
+
+            expires = time.monotonic() + self.CONFIG_CACHE_TTL_SECONDS
+            for key in missing:
+                value = fetched.get(key)
+                values[key] = value
+                self._config_cache[key] = (value, expires)
+
+        return values
 
     async def set_config(self, key: str, value: str):
         """Set a configuration value."""
+        self._config_cache.pop(key, None)
         async with self._session() as session:
             stmt = pg_insert(Config).values(
                 key=key,
@@ -126,9 +445,10 @@ class Database:
             
             if subsidiary:
                 query = query.where(MonitoredPlan.subsidiary == subsidiary)
-            
+
             result = await session.execute(query)
-            return [dict(row._mapping) for row in result.all()]
+            # RowMappings are read-only dict views; skips a dict copy per row
+            return result.mappings().all()
 
     async def get_monitored_subsidiaries(self) -> List[str]:
         """Get list of subsidiaries to monitor from config."""
@@ -156,81 +476,172 @@ class Database:
         visibility_tags: str = None,
         product_line: str = 'legacy'
     ) -> str:
-        """Insert or update a plan. Returns 'added', 'updated', 'reactivated', or 'unchanged'."""
+        """Insert or update a plan in one UPSERT. Returns 'added', 'updated', 'reactivated', or 'unchanged'."""
         async with self._session() as session:
-            # Check if exists
-            existing = await session.execute(
-                select(MonitoredPlan.id, MonitoredPlan.catalog_status)
+            # Snapshot the pre-statement status in a CTE so added/reactivated
+            # can be classified without a separate SELECT round trip.
+            old_plan = (
+                select(MonitoredPlan.catalog_status)
                 .where(and_(
                     MonitoredPlan.plan_code == plan_code,
                     MonitoredPlan.subsidiary == subsidiary
                 ))
+                .cte('old_plan')
             )
-            row = existing.first()
-            
-            if row:
-                was_discontinued = row.catalog_status == 'discontinued'
-                
-                # Update specs and mark as seen/active
-                await session.execute(
-                    update(MonitoredPlan)
-                    .where(and_(
-                        MonitoredPlan.plan_code == plan_code,
-                        MonitoredPlan.subsidiary == subsidiary
-                    ))
-                    .values(
-                        display_name=display_name or MonitoredPlan.display_name,
-                        url=url,
-                        purchase_url=purchase_url,
-                        vcpu=vcpu if vcpu is not None else MonitoredPlan.vcpu,
-                        ram_gb=ram_gb if ram_gb is not None else MonitoredPlan.ram_gb,
-                        storage_gb=storage_gb if storage_gb is not None else MonitoredPlan.storage_gb,
-                        storage_type=storage_type if storage_type is not None else MonitoredPlan.storage_type,
-                        bandwidth_mbps=bandwidth_mbps if bandwidth_mbps is not None else MonitoredPlan.bandwidth_mbps,
-                        description=description if description is not None else MonitoredPlan.description,
-                        is_orderable=is_orderable,
-                        visibility_tags=visibility_tags,
-                        product_line=product_line,
-                        catalog_status='active',
-                        last_seen_at=func.now(),
-                        discontinued_at=None,
-                        updated_at=func.now()
-                    )
-                )
-                await session.commit()
-                return 'reactivated' if was_discontinued else 'updated'
-            else:
-                # Insert new plan
-                plan = MonitoredPlan(
-                    plan_code=plan_code,
-                    subsidiary=subsidiary,
-                    display_name=display_name,
-                    url=url,
-                    purchase_url=purchase_url,
-                    vcpu=vcpu,
-                    ram_gb=ram_gb,
-                    storage_gb=storage_gb,
-                    storage_type=storage_type,
-                    bandwidth_mbps=bandwidth_mbps,
-                    description=description,
-                    is_orderable=is_orderable,
-                    visibility_tags=visibility_tags,
-                    product_line=product_line,
-                    enabled=True,
-                    catalog_status='new'
-                )
-                session.add(plan)
-                await session.commit()
+
+            stmt = pg_insert(MonitoredPlan).values(
+                plan_code=plan_code,
+                subsidiary=subsidiary,
+                display_name=display_name,
+                url=url,
+                purchase_url=purchase_url,
+                vcpu=vcpu,
+                ram_gb=ram_gb,
+                storage_gb=storage_gb,
+                storage_type=storage_type,
+                bandwidth_mbps=bandwidth_mbps,
+                description=description,
+                is_orderable=is_orderable,
+                visibility_tags=visibility_tags,
+                product_line=product_line,
+                enabled=True,
+                catalog_status='new'
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['plan_code', 'subsidiary'],
+                set_={
+                    # Keep the existing value when the new one is NULL
+                    'display_name': func.coalesce(stmt.excluded.display_name, MonitoredPlan.display_name),
+                    'url': stmt.excluded.url,
+                    'purchase_url': stmt.excluded.purchase_url,
+                    'vcpu': func.coalesce(stmt.excluded.vcpu, MonitoredPlan.vcpu),
+                    'ram_gb': func.coalesce(stmt.excluded.ram_gb, MonitoredPlan.ram_gb),
+                    'storage_gb': func.coalesce(stmt.excluded.storage_gb, MonitoredPlan.storage_gb),
+                    'storage_type': func.coalesce(stmt.excluded.storage_type, MonitoredPlan.storage_type),
+                    'bandwidth_mbps': func.coalesce(stmt.excluded.bandwidth_mbps, MonitoredPlan.bandwidth_mbps),
+                    'description': func.coalesce(stmt.excluded.description, MonitoredPlan.description),
+                    'is_orderable': stmt.excluded.is_orderable,
+                    'visibility_tags': stmt.excluded.visibility_tags,
+                    'product_line': stmt.excluded.product_line,
+                    'catalog_status': 'active',
+                    'last_seen_at': func.now(),
+                    'discontinued_at': None,
+                    'updated_at': func.now()
+                }
+            ).add_cte(old_plan).returning(
+                select(old_plan.c.catalog_status).scalar_subquery().label('old_status')
+            )
+
+            result = await session.execute(stmt)
+            old_status = result.scalar_one()
+            await session.commit()
+
+            if old_status is None:
                 return 'added'
+            return 'reactivated' if old_status == 'discontinued' else 'updated'
+
+    # Columns refreshed from the incoming row when a bulk plan upsert conflicts
+    _PLAN_UPDATE_COLS = (
+        'display_name', 'url', 'purchase_url', 'vcpu', 'ram_gb', 'storage_gb',
+        'storage_type', 'bandwidth_mbps', 'description', 'is_orderable',
+        'visibility_tags', 'product_line'
+    )
+
+    async def upsert_plans_bulk(self, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Upsert many plans in one statement. Returns {'added': n, 'updated': n}."""
+        if not rows:
+            return {'added': 0, 'updated': 0}
+
+        # ON CONFLICT DO UPDATE cannot touch the same row twice in one statement
+        deduped = list({(r['plan_code'], r['subsidiary']): r for r in rows}.values())
 
-    async def mark_plans_discontinued(self, active_plan_codes: list, subsidiary: str) -> int:
-        """Mark plans not in the active list as discontinued for a specific subsidiary."""
         async with self._session() as session:
-            result = await session.execute(
+            stmt = pg_insert(MonitoredPlan).values(deduped)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['plan_code', 'subsidiary'],
+                set_={
+                    **{col: stmt.excluded[col] for col in self._PLAN_UPDATE_COLS},
+                    'catalog_status': 'active',
+                    'last_seen_at': func.now(),
+                    'discontinued_at': None,
+                    'updated_at': func.now()
+                }
+            ).returning(literal_column('(xmax = 0)').label('inserted'))
+            result = await session.execute(stmt)
+            inserted_flags = [row.inserted for row in result]
+            await session.commit()
+
+        added = sum(1 for flag in inserted_flags if flag)
+        return {'added': added, 'updated': len(inserted_flags) - added}
+
+    async def save_pricing_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """Upsert many pricing rows in one statement. Returns the row count."""
+        if not rows:
+            return 0
+
+        deduped = list({
+            (r['plan_code'], r['subsidiary'], r['commitment_months']): r for r in rows
+        }.values())
+
+        async with self._session() as session:
+            stmt = pg_insert(PlanPricing).values(deduped)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['plan_code', 'subsidiary', 'commitment_months'],
+                set_={
+                    'price_microcents': stmt.excluded.price_microcents,
+                    'currency': stmt.excluded.currency,
+                    'description': stmt.excluded.description,
+                    'updated_at': func.now()
+                }
+            )
+            await session.execute(stmt)
+            await session.commit()
+
+        return len(deduped)
+
+    async def upsert_datacenter_locations_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """Upsert many datacenter locations in one statement. Returns the row count."""
+        if not rows:
+            return 0
+
+        deduped = list({(r['datacenter_code'], r['subsidiary']): r for r in rows}.values())
+
+        async with self._session() as session:
+            stmt = pg_insert(DatacenterLocation).values(deduped)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['datacenter_code', 'subsidiary'],
+                set_={
+                    'display_name': stmt.excluded.display_name,
+                    'city': stmt.excluded.city,
+                    'country': stmt.excluded.country,
+                    'country_code': stmt.excluded.country_code,
+                    'flag': stmt.excluded.flag,
+                    'region': stmt.excluded.region
+                }
+            )
+            await session.execute(stmt)
+            await session.commit()
+
+        return len(deduped)
+
+    async def finalize_catalog_sync(self, active_by_subsidiary: Dict[str, List[str]]) -> Dict[str, int]:
+        """Run the post-sync lifecycle updates in one transaction.
+
+        Marks plans missing from the active lists as discontinued (matched
+        against a VALUES list of (subsidiary, plan_code) pairs) and ages
+        'new' plans to 'active'. Returns {'discontinued': n, 'activated': n}.
+        """
+        rows = [
+            (subsidiary, plan_code)
+            for subsidiary, codes in active_by_subsidiary.items()
+            for plan_code in codes
+        ]
+
+        async with self._session() as session:
+            discontinue_stmt = (
                 update(MonitoredPlan)
                 .where(and_(
-                    MonitoredPlan.subsidiary == subsidiary,
-                    MonitoredPlan.plan_code.notin_(active_plan_codes),
+                    MonitoredPlan.subsidiary.in_(list(active_by_subsidiary)),
                     MonitoredPlan.catalog_status != 'discontinued'
                 ))
                 .values(
@@ -239,13 +650,20 @@ class Database:
                     updated_at=func.now()
                 )
             )
-            await session.commit()
-            return result.rowcount
+            if rows:
+                incoming = sa_values(
+                    column('subsidiary', String),
+                    column('plan_code', String),
+                    name='incoming'
+                ).data(rows)
+                discontinue_stmt = discontinue_stmt.where(
+                    tuple_(MonitoredPlan.subsidiary, MonitoredPlan.plan_code)
+                    .notin_(select(incoming.c.subsidiary, incoming.c.plan_code))
+                )
 
-    async def mark_new_plans_active(self) -> int:
-        """Mark 'new' plans as 'active' after their first sync."""
-        async with self._session() as session:
-            result = await session.execute(
+            discontinued = (await session.execute(discontinue_stmt)).rowcount
+
+            activated = (await session.execute(
                 update(MonitoredPlan)
                 .where(and_(
                     MonitoredPlan.catalog_status == 'new',
@@ -255,46 +673,55 @@ class Database:
                     catalog_status='active',
                     updated_at=func.now()
                 )
-            )
+            )).rowcount
+
             await session.commit()
-            return result.rowcount
 
-    async def get_plan_info(self, plan_code: str, subsidiary: str = 'US') -> Optional[Dict[str, Any]]:
+        return {'discontinued': discontinued, 'activated': activated}
+
+    async def get_plan_info(
+        self, plan_code: str, subsidiary: str = 'US', session: Optional[AsyncSession] = None
+    ) -> Optional[Dict[str, Any]]:
         """Get plan info by plan code including pricing."""
+        if session is not None:
+            return await self._get_plan_info(session, plan_code, subsidiary)
         async with self._session() as session:
-            result = await session.execute(
-                select(
-                    MonitoredPlan.plan_code,
-                    MonitoredPlan.subsidiary,
-                    MonitoredPlan.display_name,
-                    MonitoredPlan.url,
-                    MonitoredPlan.purchase_url,
-                    MonitoredPlan.is_orderable,
-                    MonitoredPlan.product_line,
-                    PlanPricing.price_microcents,
-                    PlanPricing.commitment_months,
-                    PlanPricing.currency
-                )
-                .outerjoin(PlanPricing, and_(
-                    PlanPricing.plan_code == MonitoredPlan.plan_code,
-                    PlanPricing.subsidiary == MonitoredPlan.subsidiary,
-                    PlanPricing.commitment_months == 0
-                ))
-                .where(and_(
-                    MonitoredPlan.plan_code == plan_code,
-                    MonitoredPlan.subsidiary == subsidiary
-                ))
+            return await self._get_plan_info(session, plan_code, subsidiary)
+
+    async def _get_plan_info(self, session: AsyncSession, plan_code: str, subsidiary: str) -> Optional[Dict[str, Any]]:
+        result = await session.execute(
+            select(
+                MonitoredPlan.plan_code,
+                MonitoredPlan.subsidiary,
+                MonitoredPlan.display_name,
+                MonitoredPlan.url,
+                MonitoredPlan.purchase_url,
+                MonitoredPlan.is_orderable,
+                MonitoredPlan.product_line,
+                PlanPricing.price_microcents,
+                PlanPricing.commitment_months,
+                PlanPricing.currency
             )
-            row = result.first()
-            
-            if row:
-                r = dict(row._mapping)
-                if r.get('price_microcents'):
-                    r['price'] = format_price(r['price_microcents'], r.get('currency', 'USD'))
-                else:
-                    r['price'] = None
-                return r
-            return None
+            .outerjoin(PlanPricing, and_(
+                PlanPricing.plan_code == MonitoredPlan.plan_code,
+                PlanPricing.subsidiary == MonitoredPlan.subsidiary,
+                PlanPricing.commitment_months == 0
+            ))
+            .where(and_(
+                MonitoredPlan.plan_code == plan_code,
+                MonitoredPlan.subsidiary == subsidiary
+            ))
+        )
+        row = result.first()
+
+        if row:
+            r = dict(row._mapping)
+            if r.get('price_microcents'):
+                r['price'] = format_price(r['price_microcents'], r.get('currency', 'USD'))
+            else:
+                r['price'] = None
+            return r
+        return None
 
     async def save_pricing(
         self,
@@ -336,33 +763,46 @@ class Database:
         country: str = "",
         country_code: str = "",
         flag: str = "🌐",
-        region: str = "OTHER"
+        region: str = "OTHER",
+        session: Optional[AsyncSession] = None
     ):
         """Insert or update datacenter location info."""
+        stmt = pg_insert(DatacenterLocation).values(
+            datacenter_code=datacenter_code,
+            subsidiary=subsidiary,
+            display_name=display_name or city,  # Fallback to city if no display_name
+            city=city,
+            country=country,
+            country_code=country_code,
+            flag=flag,
+            region=region
+        ).on_conflict_do_update(
+            index_elements=['datacenter_code', 'subsidiary'],
+            set_={
+                'display_name': display_name or city,
+                'city': city,
+                'country': country,
+                'country_code': country_code,
+                'flag': flag,
+                'region': region
+            }
+        )
+        if session is not None:
+            await session.execute(stmt)
+            return
         async with self._session() as session:
-            stmt = pg_insert(DatacenterLocation).values(
-                datacenter_code=datacenter_code,
-                subsidiary=subsidiary,
-                display_name=display_name or city,  # Fallback to city if no display_name
-                city=city,
-                country=country,
-                country_code=country_code,
-                flag=flag,
-                region=region
-            ).on_conflict_do_update(
-                index_elements=['datacenter_code', 'subsidiary'],
-                set_={
-                    'display_name': display_name or city,
-                    'city': city,
-                    'country': country,
-                    'country_code': country_code,
-                    'flag': flag,
-                    'region': region
-                }
-            )
             await session.execute(stmt)
             await session.commit()
 
+    async def get_all_datacenter_codes(self, subsidiary: str = 'US') -> List[str]:
+        """Get every known datacenter code for a subsidiary."""
+        async with self._session() as session:
+            result = await session.execute(
+                select(DatacenterLocation.datacenter_code)
+                .where(DatacenterLocation.subsidiary == subsidiary)
+            )
+            return [row[0] for row in result.all()]
+
     # ============ Inventory Status ============
 
     async def save_inventory_status(
@@ -375,134 +815,192 @@ class Database:
         linux_status: str,
         raw_response: Dict[str, Any]
     ):
-        """Save inventory status check result."""
-        async with self._session() as session:
-            status = InventoryStatus(
-                plan_code=plan_code,
-                subsidiary=subsidiary,
-                datacenter=datacenter,
-                datacenter_code=datacenter_code,
-                is_available=is_available,
-                linux_status=linux_status,
-                raw_response=raw_response
-            )
-            session.add(status)
-            await session.commit()
+        """Save inventory status check result (buffered, flushed in batches)."""
+        await self._buffer_row('inventory_status', (
+            plan_code,
+            subsidiary,
+            datacenter,
+            datacenter_code,
+            is_available,
+            linux_status,
+            _json_dumps(raw_response) if raw_response is not None else None
+        ))
+        self.record_current_inventory(
+            plan_code, subsidiary, datacenter, datacenter_code,
+            is_available, linux_status
+        )
 
-    async def get_last_status(self, plan_code: str, datacenter: str, subsidiary: str = 'US') -> Optional[Dict[str, Any]]:
+    def record_current_inventory(
+        self,
+        plan_code: str,
+        subsidiary: str,
+        datacenter: str,
+        datacenter_code: str,
+        is_available: bool,
+        linux_status: str
+    ):
+        """Queue a current_inventory upsert for a completed check.
+
+        Called on every check — not just when a history row is written —
+        so current_inventory.checked_at always reflects the last poll.
+        """
+        self._current_inventory_buffer[(plan_code, subsidiary, datacenter)] = {
+            'plan_code': plan_code,
+            'subsidiary': subsidiary,
+            'datacenter': datacenter,
+            'datacenter_code': datacenter_code,
+            'is_available': is_available,
+            'linux_status': linux_status,
+        }
+
+    def touch_current_inventory(self, plan_code: str, subsidiary: str):
+        """Mark a plan's check as completed with unchanged content (304),
+        refreshing checked_at on its current_inventory rows at next flush."""
+        self._current_inventory_touch.add((plan_code, subsidiary))
+
+    async def get_last_status(
+        self, plan_code: str, datacenter: str, subsidiary: str = 'US', session: Optional[AsyncSession] = None
+    ) -> Optional[Dict[str, Any]]:
         """Get the last known status for a plan/datacenter combo."""
+        if session is not None:
+            return await self._get_last_status(session, plan_code, datacenter, subsidiary)
         async with self._session() as session:
-            result = await session.execute(
-                select(InventoryStatus.is_available, InventoryStatus.checked_at)
-                .where(and_(
-                    InventoryStatus.plan_code == plan_code,
-                    InventoryStatus.datacenter == datacenter,
-                    InventoryStatus.subsidiary == subsidiary
-                ))
-                .order_by(InventoryStatus.checked_at.desc())
-                .limit(1)
+            return await self._get_last_status(session, plan_code, datacenter, subsidiary)
+
+    async def _get_last_status(
+        self, session: AsyncSession, plan_code: str, datacenter: str, subsidiary: str
+    ) -> Optional[Dict[str, Any]]:
+        result = await session.execute(_GET_LAST_STATUS_STMT, {
+            'plan_code': plan_code, 'datacenter': datacenter, 'subsidiary': subsidiary
+        })
+        row = result.first()
+        return dict(row._mapping) if row else None
+
+    async def get_last_statuses(
+        self, plan_code: str, subsidiary: str = 'US', session: Optional[AsyncSession] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get the last known status for every datacenter of a plan in one query."""
+        stmt = (
+            select(
+                CurrentInventory.datacenter,
+                CurrentInventory.is_available,
+                CurrentInventory.linux_status,
+                CurrentInventory.checked_at
             )
-            row = result.first()
-            return dict(row._mapping) if row else None
+            .where(and_(
+                CurrentInventory.plan_code == plan_code,
+                CurrentInventory.subsidiary == subsidiary
+            ))
+        )
+        if session is not None:
+            result = await session.execute(stmt)
+        else:
+            async with self._session() as session:
+                result = await session.execute(stmt)
+        return {row['datacenter']: row for row in result.mappings()}
 
     # ============ Out of Stock Tracking ============
 
-    async def track_out_of_stock(self, plan_code: str, datacenter: str, subsidiary: str = 'US'):
+    async def track_out_of_stock(
+        self, plan_code: str, datacenter: str, subsidiary: str = 'US', session: Optional[AsyncSession] = None
+    ):
         """Start tracking when an item goes out of stock."""
+        if session is not None:
+            await self._track_out_of_stock(session, plan_code, datacenter, subsidiary)
+            return
         async with self._session() as session:
-            # Check if already tracking
-            existing = await session.execute(
-                select(OutOfStockTracking.id)
-                .where(and_(
-                    OutOfStockTracking.plan_code == plan_code,
-                    OutOfStockTracking.datacenter == datacenter,
-                    OutOfStockTracking.subsidiary == subsidiary,
-                    OutOfStockTracking.returned_to_stock_at.is_(None)
-                ))
+            await self._track_out_of_stock(session, plan_code, datacenter, subsidiary)
+            await session.commit()
+
+    async def _track_out_of_stock(self, session: AsyncSession, plan_code: str, datacenter: str, subsidiary: str):
+        # Check if already tracking
+        existing = await session.execute(
+            select(OutOfStockTracking.id)
+            .where(and_(
+                OutOfStockTracking.plan_code == plan_code,
+                OutOfStockTracking.datacenter == datacenter,
+                OutOfStockTracking.subsidiary == subsidiary,
+                OutOfStockTracking.returned_to_stock_at.is_(None)
+            ))
+        )
+
+        if not existing.scalar_one_or_none():
+            tracking = OutOfStockTracking(
+                plan_code=plan_code,
+                subsidiary=subsidiary,
+                datacenter=datacenter,
+                out_of_stock_since=func.now()
             )
-            
-            if not existing.scalar_one_or_none():
-                tracking = OutOfStockTracking(
-                    plan_code=plan_code,
-                    subsidiary=subsidiary,
-                    datacenter=datacenter,
-                    out_of_stock_since=func.now()
-                )
-                session.add(tracking)
-                await session.commit()
+            session.add(tracking)
 
-    async def get_out_of_stock_duration(self, plan_code: str, datacenter: str, subsidiary: str = 'US') -> Optional[int]:
+    async def get_out_of_stock_duration(
+        self, plan_code: str, datacenter: str, subsidiary: str = 'US', session: Optional[AsyncSession] = None
+    ) -> Optional[int]:
         """Get how long an item has been out of stock in minutes."""
+        if session is not None:
+            return await self._get_out_of_stock_duration(session, plan_code, datacenter, subsidiary)
         async with self._session() as session:
-            result = await session.execute(
-                select(
-                    (func.extract('epoch', func.now() - OutOfStockTracking.out_of_stock_since) / 60)
-                    .label('minutes')
-                )
-                .where(and_(
-                    OutOfStockTracking.plan_code == plan_code,
-                    OutOfStockTracking.datacenter == datacenter,
-                    OutOfStockTracking.subsidiary == subsidiary,
-                    OutOfStockTracking.returned_to_stock_at.is_(None)
-                ))
-            )
-            row = result.first()
-            return int(row.minutes) if row and row.minutes else None
+            return await self._get_out_of_stock_duration(session, plan_code, datacenter, subsidiary)
+
+    async def _get_out_of_stock_duration(
+        self, session: AsyncSession, plan_code: str, datacenter: str, subsidiary: str
+    ) -> Optional[int]:
+        result = await session.execute(_OUT_OF_STOCK_DURATION_STMT, {
+            'plan_code': plan_code, 'datacenter': datacenter, 'subsidiary': subsidiary
+        })
+        row = result.first()
+        return int(row.minutes) if row and row.minutes else None
 
-    async def mark_returned_to_stock(self, plan_code: str, datacenter: str, subsidiary: str = 'US') -> Optional[int]:
+    async def mark_returned_to_stock(
+        self, plan_code: str, datacenter: str, subsidiary: str = 'US', session: Optional[AsyncSession] = None
+    ) -> Optional[int]:
         """Mark item as returned to stock and return how long it was out."""
+        if session is not None:
+            return await self._mark_returned_to_stock(session, plan_code, datacenter, subsidiary)
         async with self._session() as session:
-            # First get the duration
-            duration_result = await session.execute(
-                select(
-                    (func.extract('epoch', func.now() - OutOfStockTracking.out_of_stock_since) / 60)
-                    .label('minutes')
-                )
-                .where(and_(
-                    OutOfStockTracking.plan_code == plan_code,
-                    OutOfStockTracking.datacenter == datacenter,
-                    OutOfStockTracking.subsidiary == subsidiary,
-                    OutOfStockTracking.returned_to_stock_at.is_(None)
-                ))
-            )
-            duration_row = duration_result.first()
-            minutes = int(duration_row.minutes) if duration_row and duration_row.minutes else None
-            
-            # Then update
-            await session.execute(
-                update(OutOfStockTracking)
-                .where(and_(
-                    OutOfStockTracking.plan_code == plan_code,
-                    OutOfStockTracking.datacenter == datacenter,
-                    OutOfStockTracking.subsidiary == subsidiary,
-                    OutOfStockTracking.returned_to_stock_at.is_(None)
-                ))
-                .values(returned_to_stock_at=func.now())
-            )
+            minutes = await self._mark_returned_to_stock(session, plan_code, datacenter, subsidiary)
             await session.commit()
-            
             return minutes
 
-    async def get_in_stock_duration(self, plan_code: str, datacenter: str, subsidiary: str = 'US') -> Optional[int]:
+    async def _mark_returned_to_stock(
+        self, session: AsyncSession, plan_code: str, datacenter: str, subsidiary: str
+    ) -> Optional[int]:
+        # Update and compute the duration in one round trip
+        result = await session.execute(
+            update(OutOfStockTracking)
+            .where(and_(
+                OutOfStockTracking.plan_code == plan_code,
+                OutOfStockTracking.datacenter == datacenter,
+                OutOfStockTracking.subsidiary == subsidiary,
+                OutOfStockTracking.returned_to_stock_at.is_(None)
+            ))
+            .values(returned_to_stock_at=func.now())
+            .returning(
+                (func.extract('epoch', func.now() - OutOfStockTracking.out_of_stock_since) / 60)
+                .label('minutes')
+            )
+        )
+        row = result.first()
+        return int(row.minutes) if row and row.minutes else None
+
+    async def get_in_stock_duration(
+        self, plan_code: str, datacenter: str, subsidiary: str = 'US', session: Optional[AsyncSession] = None
+    ) -> Optional[int]:
         """Get how long an item has been in stock (since last return) in minutes."""
+        if session is not None:
+            return await self._get_in_stock_duration(session, plan_code, datacenter, subsidiary)
         async with self._session() as session:
-            # Find the most recent returned_to_stock_at timestamp
-            result = await session.execute(
-                select(
-                    (func.extract('epoch', func.now() - OutOfStockTracking.returned_to_stock_at) / 60)
-                    .label('minutes')
-                )
-                .where(and_(
-                    OutOfStockTracking.plan_code == plan_code,
-                    OutOfStockTracking.datacenter == datacenter,
-                    OutOfStockTracking.subsidiary == subsidiary,
-                    OutOfStockTracking.returned_to_stock_at.isnot(None)
-                ))
-                .order_by(OutOfStockTracking.returned_to_stock_at.desc())
-                .limit(1)
-            )
-            row = result.first()
-            return int(row.minutes) if row and row.minutes else None
+            return await self._get_in_stock_duration(session, plan_code, datacenter, subsidiary)
+
+    async def _get_in_stock_duration(
+        self, session: AsyncSession, plan_code: str, datacenter: str, subsidiary: str
+    ) -> Optional[int]:
+        # Finds the most recent returned_to_stock_at timestamp
+        result = await session.execute(_IN_STOCK_DURATION_STMT, {
+            'plan_code': plan_code, 'datacenter': datacenter, 'subsidiary': subsidiary
+        })
+        row = result.first()
+        return int(row.minutes) if row and row.minutes else None
 
     # ============ Notifications ============
 
@@ -515,23 +1013,25 @@ class Database:
         error_message: Optional[str] = None,
         subsidiary: str = 'US'
     ):
-        """Save notification history."""
-        async with self._session() as session:
-            notif = NotificationHistory(
-                plan_code=plan_code,
-                subsidiary=subsidiary,
-                datacenter=datacenter,
-                message=message,
-                success=success,
-                error_message=error_message
-            )
-            session.add(notif)
-            await session.commit()
+        """Save notification history (buffered, flushed in batches)."""
+        await self._buffer_row('notification_history', (
+            plan_code,
+            subsidiary,
+            datacenter,
+            message,
+            success,
+            error_message
+        ))
 
     # ============ Multi-tenant User Notifications ============
 
     async def get_users_subscribed_to_plan(self, plan_code: str, subsidiary: str = 'US') -> List[Dict[str, Any]]:
         """Get all users subscribed to a specific plan with their active webhooks."""
+        cache_key = (plan_code, subsidiary)
+        cached = self._subscriber_cache.get(cache_key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+
         async with self._session() as session:
             result = await session.execute(
                 select(
@@ -539,7 +1039,12 @@ class Database:
                     User.email,
                     UserWebhook.id.label('webhook_id'),
                     UserWebhook.webhook_url,
-                    UserWebhook.webhook_name
+                    UserWebhook.webhook_name,
+                    UserWebhook.webhook_type,
+                    UserWebhook.bot_username,
+                    UserWebhook.mention_role_id,
+                    UserWebhook.embed_color,
+                    UserWebhook.slack_channel
                 )
                 .distinct()
                 .join(UserPlanSubscription, UserPlanSubscription.user_id == User.id)
@@ -557,7 +1062,12 @@ class Database:
                     User.is_active == True
                 ))
             )
-            return [dict(row._mapping) for row in result.all()]
+            rows = result.mappings().all()
+
+        self._subscriber_cache[cache_key] = (
+            rows, time.monotonic() + self.SUBSCRIBER_CACHE_TTL_SECONDS
+        )
+        return rows
 
     async def save_user_notification(
         self,
@@ -570,17 +1080,21 @@ class Database:
         webhook_id: Optional[int] = None,
         is_default_webhook: bool = False
     ):
-        """Save user notification history."""
-        async with self._session() as session:
-            notif = UserNotificationHistory(
-                user_id=user_id,
-                webhook_id=webhook_id,
-                plan_code=plan_code,
-                datacenter=datacenter,
-                message=message,
-                success=success,
-                error_message=error_message,
-                is_default_webhook=is_default_webhook
-            )
-            session.add(notif)
-            await session.commit()
+        """Save user notification history (buffered, flushed in batches)."""
+        await self._buffer_row('user_notification_history', (
+            user_id,
+            webhook_id,
+            plan_code,
+            datacenter,
+            message,
+            success,
+            error_message,
+            is_default_webhook
+        ))
+
+    async def save_user_notifications_bulk(self, rows: List[Dict[str, Any]]):
+        """Save multiple user notification history rows in a single batch."""
+        for row in rows:
+            await self._buffer_row('user_notification_history', tuple(
+                row.get(col) for col in self._USER_NOTIFICATION_COLUMNS
+            ))
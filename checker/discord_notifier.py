@@ -2,6 +2,7 @@
 Discord and Slack notification handler.
 Uses the unified WebhookNotifier for actual sending.
 """
+import asyncio
 import logging
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
@@ -10,6 +11,10 @@ from webhook_notifier import WebhookNotifier
 
 logger = logging.getLogger(__name__)
 
+# Cap on concurrent per-user webhook POSTs so fan-out stays polite to
+# Discord/Slack while still overlapping the network round trips
+USER_FANOUT_CONCURRENCY = 10
+
 
 async def send_discord_notification(
     webhook_url: str,
@@ -20,7 +25,8 @@ async def send_discord_notification(
     plan_info: Optional[Dict[str, Any]] = None,
     user_info: Optional[Dict[str, Any]] = None,
     subsidiary: str = 'US',
-    webhook_type: str = 'discord'
+    webhook_type: str = 'discord',
+    prebuilt_embed: Optional[Dict[str, Any]] = None
 ) -> Tuple[bool, Optional[str]]:
     """Send a webhook notification (Discord or Slack)."""
     if not webhook_url:
@@ -45,7 +51,9 @@ async def send_discord_notification(
         kwargs['mention_role_id'] = user_info.get('mention_role_id')
         kwargs['embed_color'] = user_info.get('embed_color')
         kwargs['slack_channel'] = user_info.get('slack_channel')
-    
+    if prebuilt_embed is not None and webhook_type == 'discord':
+        kwargs['prebuilt_embed'] = prebuilt_embed
+
     success, error = await WebhookNotifier.send_stock_notification(
         webhook_url=webhook_url,
         webhook_type=webhook_type,
@@ -71,7 +79,8 @@ async def send_out_of_stock_notification(
     plan_info: Optional[Dict[str, Any]] = None,
     user_info: Optional[Dict[str, Any]] = None,
     subsidiary: str = 'US',
-    webhook_type: str = 'discord'
+    webhook_type: str = 'discord',
+    prebuilt_embed: Optional[Dict[str, Any]] = None
 ) -> Tuple[bool, Optional[str]]:
     """Send an out-of-stock webhook notification (Discord or Slack)."""
     if not webhook_url:
@@ -80,7 +89,7 @@ async def send_out_of_stock_notification(
     # Auto-detect webhook type if not specified
     if not webhook_type:
         webhook_type = WebhookNotifier.detect_webhook_type(webhook_url)
-    
+
     # Prepare notification parameters
     kwargs = {}
     if user_info:
@@ -89,7 +98,9 @@ async def send_out_of_stock_notification(
         kwargs['mention_role_id'] = user_info.get('mention_role_id')
         kwargs['embed_color'] = user_info.get('embed_color')
         kwargs['slack_channel'] = user_info.get('slack_channel')
-    
+    if prebuilt_embed is not None and webhook_type == 'discord':
+        kwargs['prebuilt_embed'] = prebuilt_embed
+
     success, error = await WebhookNotifier.send_out_of_stock_notification(
         webhook_url=webhook_url,
         webhook_type=webhook_type,
@@ -127,14 +138,22 @@ async def send_out_of_stock_notifications_to_all(
         "user_webhooks": []
     }
     
+    # Fetch the default-webhook config keys in one round trip
+    config = await db.get_configs(["monitored_subsidiaries", "discord_webhook_url"])
+
     # Check if this subsidiary should receive default webhook alerts
-    monitored_subsidiaries_str = await db.get_config("monitored_subsidiaries") or "US"
+    monitored_subsidiaries_str = config.get("monitored_subsidiaries") or "US"
     monitored_subsidiaries = [s.strip().upper() for s in monitored_subsidiaries_str.split(',')]
     send_default_alerts = subsidiary.upper() in monitored_subsidiaries
-    
+
+    # The Discord embed body is identical for every recipient of this event
+    base_embed = WebhookNotifier.build_out_of_stock_embed(
+        plan_code, datacenter, in_stock_minutes, plan_info, subsidiary
+    )
+
     # 1. Send to default system webhook (Discord) - only if subsidiary is monitored
     if send_default_alerts:
-        default_webhook_url = await db.get_config("discord_webhook_url")
+        default_webhook_url = config.get("discord_webhook_url")
         if default_webhook_url:
             success, error = await send_out_of_stock_notification(
                 default_webhook_url,
@@ -143,45 +162,64 @@ async def send_out_of_stock_notifications_to_all(
                 in_stock_minutes,
                 plan_info=plan_info,
                 subsidiary=subsidiary,
-                webhook_type='discord'
+                webhook_type='discord',
+                prebuilt_embed=base_embed
             )
             results["default_webhook"] = {"sent": True, "success": success, "error": error}
     
-    # 2. Send to all subscribed users (regardless of subsidiary)
-    subscribed_users = await db.get_subscribed_users_for_plan(plan_code, subsidiary)
-    
-    for user in subscribed_users:
-        webhook_url = user.get("discord_webhook_url") or user.get("slack_webhook_url")
-        if not webhook_url:
-            continue
-        
-        webhook_type = 'slack' if user.get("slack_webhook_url") else 'discord'
+    # 2. Send to all subscribed users (regardless of subsidiary), concurrently
+    subscribed_users = await db.get_users_subscribed_to_plan(plan_code, subsidiary)
+
+    sem = asyncio.Semaphore(USER_FANOUT_CONCURRENCY)
+
+    async def notify_user(user):
+        # Get webhook type (default to discord for backwards compatibility)
+        webhook_type = user.get("webhook_type", "discord")
+
         user_info = {
+            "user_id": user["user_id"],
+            "webhook_id": user["webhook_id"],
+            "webhook_name": user.get("webhook_name", "Personal Alert"),
             "bot_username": user.get("bot_username"),
-            "webhook_name": user.get("webhook_name"),
             "mention_role_id": user.get("mention_role_id"),
             "embed_color": user.get("embed_color"),
             "slack_channel": user.get("slack_channel"),
         }
-        
-        success, error = await send_out_of_stock_notification(
-            webhook_url,
-            plan_code,
-            datacenter,
-            in_stock_minutes,
-            plan_info=plan_info,
-            user_info=user_info,
-            subsidiary=subsidiary,
-            webhook_type=webhook_type
-        )
-        
+
+        async with sem:
+            success, error = await send_out_of_stock_notification(
+                user["webhook_url"],
+                plan_code,
+                datacenter,
+                in_stock_minutes,
+                plan_info=plan_info,
+                user_info=user_info,
+                subsidiary=subsidiary,
+                webhook_type=webhook_type,
+                prebuilt_embed=base_embed
+            )
+        return webhook_type, success, error
+
+    outcomes = await asyncio.gather(
+        *(notify_user(user) for user in subscribed_users),
+        return_exceptions=True
+    )
+
+    for user, outcome in zip(subscribed_users, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error(f"[{subsidiary}] Out-of-stock notification failed for user {user['user_id']}: {outcome}")
+            webhook_type, success, error = user.get("webhook_type", "discord"), False, str(outcome)
+        else:
+            webhook_type, success, error = outcome
+
         results["user_webhooks"].append({
-            "user_id": user.get("user_id"),
+            "user_id": user["user_id"],
+            "webhook_id": user["webhook_id"],
             "webhook_type": webhook_type,
             "success": success,
             "error": error
         })
-    
+
     return results
 
 
@@ -205,14 +243,29 @@ async def send_notifications_to_all(
         "user_webhooks": []
     }
     
+    # Fetch the default-webhook config keys in one round trip
+    config = await db.get_configs([
+        "monitored_subsidiaries", "discord_webhook_url", "slack_webhook_url"
+    ])
+
     # Check if this subsidiary should receive default webhook alerts
-    monitored_subsidiaries_str = await db.get_config("monitored_subsidiaries") or "US"
+    monitored_subsidiaries_str = config.get("monitored_subsidiaries") or "US"
     monitored_subsidiaries = [s.strip().upper() for s in monitored_subsidiaries_str.split(',')]
     send_default_alerts = subsidiary.upper() in monitored_subsidiaries
-    
+
+    # The Discord embed body is identical for every recipient of this event,
+    # so build the skeleton once; per-user sends only override color/footer
+    base_embed = WebhookNotifier.build_stock_embed(
+        plan_code, datacenter, out_of_stock_minutes, plan_info, subsidiary
+    )
+
+    # Every history row from this fanout (default webhooks included) is
+    # collected here and written as one batch at the end
+    history_rows = []
+
     # 1. Send to default system webhook (Discord) - only if subsidiary is monitored
     if send_default_alerts:
-        default_webhook_url = await db.get_config("discord_webhook_url")
+        default_webhook_url = config.get("discord_webhook_url")
         if default_webhook_url:
             success, error = await send_discord_notification(
                 default_webhook_url,
@@ -221,7 +274,8 @@ async def send_notifications_to_all(
                 out_of_stock_minutes,
                 plan_info=plan_info,
                 subsidiary=subsidiary,
-                webhook_type='discord'
+                webhook_type='discord',
+                prebuilt_embed=base_embed
             )
             results["default_webhook"] = {"sent": True, "success": success, "error": error}
             
@@ -236,17 +290,17 @@ async def send_notifications_to_all(
             )
             
             # Also save to user_notification_history as default
-            await db.save_user_notification(
-                plan_code=plan_code,
-                datacenter=datacenter,
-                message=f"Back in stock after {out_of_stock_minutes} minutes",
-                success=success,
-                error_message=error,
-                is_default_webhook=True
-            )
+            history_rows.append({
+                "plan_code": plan_code,
+                "datacenter": datacenter,
+                "message": f"Back in stock after {out_of_stock_minutes} minutes",
+                "success": success,
+                "error_message": error,
+                "is_default_webhook": True
+            })
     
         # 2. Check for default Slack webhook as well
-        default_slack_url = await db.get_config("slack_webhook_url")
+        default_slack_url = config.get("slack_webhook_url")
         if default_slack_url:
             success, error = await send_discord_notification(
                 default_slack_url,
@@ -259,22 +313,26 @@ async def send_notifications_to_all(
             )
             
             # Save to notification history
-            await db.save_user_notification(
-                plan_code=plan_code,
-                datacenter=datacenter,
-                message=f"Back in stock after {out_of_stock_minutes} minutes (Slack)",
-                success=success,
-                error_message=error,
-                is_default_webhook=True
-            )
+            history_rows.append({
+                "plan_code": plan_code,
+                "datacenter": datacenter,
+                "message": f"Back in stock after {out_of_stock_minutes} minutes (Slack)",
+                "success": success,
+                "error_message": error,
+                "is_default_webhook": True
+            })
     
     # 3. Send to all users subscribed to this plan in this subsidiary
+    # Webhook POSTs are I/O bound, so fan them out concurrently instead of
+    # serializing N HTTP round-trips.
     subscribed_users = await db.get_users_subscribed_to_plan(plan_code, subsidiary)
-    
-    for user in subscribed_users:
+
+    sem = asyncio.Semaphore(USER_FANOUT_CONCURRENCY)
+
+    async def notify_user(user):
         # Get webhook type (default to discord for backwards compatibility)
         webhook_type = user.get("webhook_type", "discord")
-        
+
         user_info = {
             "user_id": user["user_id"],
             "webhook_id": user["webhook_id"],
@@ -284,18 +342,33 @@ async def send_notifications_to_all(
             "embed_color": user.get("embed_color"),
             "slack_channel": user.get("slack_channel")
         }
-        
-        success, error = await send_discord_notification(
-            user["webhook_url"],
-            plan_code,
-            datacenter,
-            out_of_stock_minutes,
-            plan_info=plan_info,
-            user_info=user_info,
-            subsidiary=subsidiary,
-            webhook_type=webhook_type
-        )
-        
+
+        async with sem:
+            success, error = await send_discord_notification(
+                user["webhook_url"],
+                plan_code,
+                datacenter,
+                out_of_stock_minutes,
+                plan_info=plan_info,
+                user_info=user_info,
+                subsidiary=subsidiary,
+                webhook_type=webhook_type,
+                prebuilt_embed=base_embed
+            )
+        return user, webhook_type, success, error
+
+    outcomes = await asyncio.gather(
+        *(notify_user(user) for user in subscribed_users),
+        return_exceptions=True
+    )
+
+    for user, outcome in zip(subscribed_users, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error(f"[{subsidiary}] User notification failed for user {user['user_id']}: {outcome}")
+            webhook_type, success, error = user.get("webhook_type", "discord"), False, str(outcome)
+        else:
+            _, webhook_type, success, error = outcome
+
         results["user_webhooks"].append({
             "user_id": user["user_id"],
             "webhook_id": user["webhook_id"],
@@ -303,19 +376,21 @@ async def send_notifications_to_all(
             "success": success,
             "error": error
         })
-        
-        # Save to user notification history
-        await db.save_user_notification(
-            plan_code=plan_code,
-            datacenter=datacenter,
-            message=f"Back in stock after {out_of_stock_minutes} minutes",
-            success=success,
-            error_message=error,
-            user_id=user["user_id"],
-            webhook_id=user["webhook_id"],
-            is_default_webhook=False
-        )
-        
+
+        history_rows.append({
+            "plan_code": plan_code,
+            "datacenter": datacenter,
+            "message": f"Back in stock after {out_of_stock_minutes} minutes",
+            "success": success,
+            "error_message": error,
+            "user_id": user["user_id"],
+            "webhook_id": user["webhook_id"],
+            "is_default_webhook": False
+        })
+
         logger.info(f"[{subsidiary}] User {webhook_type} notification {'sent' if success else 'failed'} for user {user['user_id']}: {plan_code}/{datacenter}")
-    
+
+    # Save every history row from this fanout in one batch
+    await db.save_user_notifications_bulk(history_rows)
+
     return results
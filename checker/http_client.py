@@ -0,0 +1,57 @@
+"""
+Shared aiohttp session for the checker process.
+
+All OVH API calls and webhook posts reuse one connector so connections are
+kept alive and pooled instead of paying a DNS lookup and TCP+TLS handshake
+per request.
+"""
+import aiohttp
+import json
+from typing import Optional
+
+# orjson is ~2-5x faster than stdlib json for the payloads on the hot path
+# (OVH availability responses, Discord embeds); fall back gracefully
+try:
+    import orjson
+
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
+# Sentinel returned by conditional fetches when the server replies 304
+NOT_MODIFIED = object()
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Get the process-wide client session, creating it on first use."""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+        )
+        # Per-operation limits instead of one total budget: a hung connect
+        # fails in 5s rather than dragging a semaphore slot for 30s, while
+        # slow-but-alive bodies can still stream
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=5, sock_read=15),
+            json_serialize=json_dumps,
+        )
+    return _session
+
+
+async def close_session():
+    """Close the shared session (called on process shutdown)."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
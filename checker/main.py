@@ -3,18 +3,32 @@ import asyncio
 import logging
 import os
 import sys
+import random
+import time
+from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 
 from database import Database
 from discord_notifier import send_discord_notification, send_notifications_to_all, send_out_of_stock_notifications_to_all
+from http_client import get_session, close_session, json_loads, NOT_MODIFIED
 from pricing_fetcher import PricingFetcher
 from catalog_fetcher import get_datacenter_location
+from webhook_notifier import close_webhook_session
 from config import settings
 
 # Import shared init_db for schema initialization
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from shared.database import init_db as init_schema
 
+# uvloop has substantially lower per-callback overhead than the default
+# loop, which matters once plan checks and webhook fanout run as hundreds
+# of concurrent tasks; fall back gracefully where it isn't installed
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -23,24 +37,94 @@ logger = logging.getLogger(__name__)
 
 
 class OVHChecker:
+    # Re-record an unchanged status at most this often so history isn't
+    # fully silent on stable days
+    INVENTORY_HEARTBEAT_MINUTES = 60
+
+    # Transient-failure retry policy for OVH availability fetches
+    FETCH_RETRY_ATTEMPTS = 3
+    FETCH_RETRY_BASE_SECONDS = 0.5
+    FETCH_RETRY_MAX_SLEEP_SECONDS = 30.0
+
+    # Reload the known-datacenter set this often so admin-side changes to
+    # datacenter_locations are eventually picked up
+    DC_CACHE_RELOAD_SECONDS = 3600
+
+    # Hard cap on queued background notification dispatches; beyond this
+    # the scan waits for one to finish before queueing more
+    MAX_PENDING_NOTIFICATIONS = 1000
+
     def __init__(self, db: Database, subsidiary: str = 'US'):
         self.db = db
         self.subsidiary = subsidiary
+        # Bounds how many plans are in flight against OVH at once
+        self.plan_semaphore = asyncio.Semaphore(settings.plan_concurrency)
+        # Datacenter codes whose location row already exists in the DB,
+        # seeded once per cycle-hour from datacenter_locations
+        self._known_dcs: set = set()
+        self._known_dcs_loaded_at: float = float('-inf')
+        # Last seen ETag per availability URL for conditional GETs
+        self._etag_cache: Dict[str, str] = {}
+        # In-flight background notification dispatches; tasks remove
+        # themselves on completion
+        self._notify_tasks: set = set()
 
     async def fetch_availability(self, url: str) -> Optional[Dict[str, Any]]:
-        """Fetch availability data from OVH API."""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=30) as response:
+        """
+        Fetch availability data from OVH API.
+
+        Sends If-None-Match with the last seen ETag; returns the
+        NOT_MODIFIED sentinel on a 304 so callers can skip parsing and
+        DB work entirely. Rate limits (429) and 5xx/connection errors are
+        retried with bounded backoff; other failures return None.
+        """
+        headers = {}
+        etag = self._etag_cache.get(url)
+        if etag:
+            headers["If-None-Match"] = etag
+
+        for attempt in range(self.FETCH_RETRY_ATTEMPTS):
+            try:
+                async with get_session().get(url, headers=headers) as response:
+                    if response.status == 304:
+                        return NOT_MODIFIED
                     if response.status == 200:
-                        data = await response.json()
+                        data = json_loads(await response.read())
+                        # Cache the ETag only once the body has parsed;
+                        # caching it earlier would turn the retry after a
+                        # parse failure into a 304 for data never processed
+                        new_etag = response.headers.get("ETag")
+                        if new_etag:
+                            self._etag_cache[url] = new_etag
                         return data
+                    if response.status == 429:
+                        try:
+                            delay = float(response.headers.get("Retry-After", 1))
+                        except (TypeError, ValueError):
+                            delay = 1.0
+                        delay = min(delay, self.FETCH_RETRY_MAX_SLEEP_SECONDS)
+                    elif response.status >= 500:
+                        delay = min(
+                            self.FETCH_RETRY_MAX_SLEEP_SECONDS,
+                            self.FETCH_RETRY_BASE_SECONDS * 2 ** attempt
+                        ) + random.uniform(0, 0.25)
                     else:
                         logger.error(f"OVH API returned {response.status} for {url}")
                         return None
-        except Exception as e:
-            logger.error(f"Error fetching {url}: {e}")
-            return None
+                    error_msg = f"OVH API returned {response.status} for {url}"
+            except Exception as e:
+                error_msg = f"Error fetching {url}: {e}"
+                delay = min(
+                    self.FETCH_RETRY_MAX_SLEEP_SECONDS,
+                    self.FETCH_RETRY_BASE_SECONDS * 2 ** attempt
+                ) + random.uniform(0, 0.25)
+
+            if attempt < self.FETCH_RETRY_ATTEMPTS - 1:
+                logger.warning(f"{error_msg}; retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            else:
+                logger.error(error_msg)
+        return None
 
     def parse_availability(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -79,6 +163,12 @@ class OVHChecker:
         logger.info(f"[{self.subsidiary}] Checking {plan_code}...")
         
         data = await self.fetch_availability(url)
+        if data is NOT_MODIFIED:
+            # OVH's response is byte-identical to last cycle; no state to
+            # process, but the check did complete, so keep checked_at fresh
+            logger.debug(f"[{self.subsidiary}] {plan_code} unchanged since last check (304)")
+            self.db.touch_current_inventory(plan_code, self.subsidiary)
+            return
         if data is None:
             logger.warning(f"[{self.subsidiary}] No data received for {plan_code}")
             return
@@ -89,60 +179,160 @@ class OVHChecker:
             logger.warning(f"[{self.subsidiary}] No datacenters found in response for {plan_code}")
             return
 
-        for avail in availabilities:
-            datacenter = avail["datacenter"]
-            datacenter_code = avail.get("datacenter_code", "")
-            is_available = avail["is_available"]
-            linux_status = avail.get("linux_status", "unknown")
-
-            # Ensure datacenter location is stored with proper display name
-            if datacenter_code:
-                loc = get_datacenter_location(datacenter_code)
-                await self.db.upsert_datacenter_location(
-                    datacenter_code=datacenter_code,
-                    subsidiary=self.subsidiary,
-                    display_name=loc['display_name'],
-                    city=loc['city'],
-                    country=loc['country'],
-                    country_code=loc['country_code'],
-                    flag=loc['flag'],
-                    region=loc['region']
+        # Get notification threshold from database (cached, allows dynamic updates)
+        notification_threshold = await get_notification_threshold(self.db)
+
+        # Last known status for all datacenters of this plan in one query,
+        # instead of one round trip per datacenter inside the loop
+        last_statuses = await self.db.get_last_statuses(plan_code, self.subsidiary)
+
+        # plan_info is identical for every datacenter of this plan, so fetch
+        # it at most once per check and reuse it across datacenters
+        plan_info = None
+
+        # Phase 1: one transaction per plan carries the reads and writes for
+        # every datacenter, so DB roundtrips per plan drop to a single
+        # connection checkout instead of one transaction per datacenter.
+        pending = []
+        async with self.db.transaction() as session:
+            for avail in availabilities:
+                datacenter = avail["datacenter"]
+                datacenter_code = avail.get("datacenter_code", "")
+                is_available = avail["is_available"]
+                linux_status = avail.get("linux_status", "unknown")
+
+                out_of_stock_minutes = None
+                in_stock_minutes = None
+
+                # Ensure datacenter location is stored with proper display name
+                # (skipped while the code is in the known set; the rows are
+                # static once written)
+                if datacenter_code and datacenter_code not in self._known_dcs:
+                    loc = get_datacenter_location(datacenter_code)
+                    await self.db.upsert_datacenter_location(
+                        datacenter_code=datacenter_code,
+                        subsidiary=self.subsidiary,
+                        display_name=loc['display_name'],
+                        city=loc['city'],
+                        country=loc['country'],
+                        country_code=loc['country_code'],
+                        flag=loc['flag'],
+                        region=loc['region'],
+                        session=session
+                    )
+                    self._known_dcs.add(datacenter_code)
+
+                # Last known status was fetched BEFORE saving the new one
+                # (otherwise we'd compare the new status to itself)
+                last_status = last_statuses.get(datacenter)
+                was_available = last_status["is_available"] if last_status else None
+
+                if is_available:
+                    if was_available is False:
+                        # It was out of stock, now it's back!
+                        out_of_stock_minutes = await self.db.mark_returned_to_stock(
+                            plan_code, datacenter, self.subsidiary, session=session
+                        )
+                        if plan_info is None:
+                            plan_info = await self.db.get_plan_info(plan_code, self.subsidiary, session=session)
+                else:
+                    if was_available is True:
+                        # It was in stock, now it's gone!
+                        in_stock_minutes = await self.db.get_in_stock_duration(
+                            plan_code, datacenter, self.subsidiary, session=session
+                        )
+                        if plan_info is None:
+                            plan_info = await self.db.get_plan_info(plan_code, self.subsidiary, session=session)
+
+                    # Track the out of stock event, unless this flip belongs to
+                    # a non-orderable plan whose notification is skipped below
+                    skip_tracking = (
+                        was_available is True
+                        and in_stock_minutes
+                        and in_stock_minutes >= notification_threshold
+                        and plan_info and not plan_info.get('is_orderable', True)
+                    )
+                    if not skip_tracking:
+                        await self.db.track_out_of_stock(plan_code, datacenter, self.subsidiary, session=session)
+
+                # Only write a history row when the status actually changed,
+                # plus an hourly heartbeat; unchanged statuses are pure write
+                # amplification on a stable day
+                changed = (
+                    last_status is None
+                    or last_status["is_available"] != is_available
+                    or last_status.get("linux_status") != linux_status
                 )
-
-            # Get last known status BEFORE saving the new one
-            # (otherwise we'd compare the new status to itself)
-            last_status = await self.db.get_last_status(plan_code, datacenter, self.subsidiary)
-            was_available = last_status["is_available"] if last_status else None
-
-            # Save current status with subsidiary
-            await self.db.save_inventory_status(
-                plan_code,
-                self.subsidiary,
-                datacenter, 
-                datacenter_code,
-                is_available, 
-                linux_status,
-                data
+                last_checked = last_status.get("checked_at") if last_status else None
+                heartbeat_due = (
+                    last_checked is not None
+                    and (datetime.now(timezone.utc) - last_checked).total_seconds()
+                    >= self.INVENTORY_HEARTBEAT_MINUTES * 60
+                )
+                if changed or heartbeat_due:
+                    # Save current status with subsidiary (buffered write)
+                    await self.db.save_inventory_status(
+                        plan_code,
+                        self.subsidiary,
+                        datacenter,
+                        datacenter_code,
+                        is_available,
+                        linux_status,
+                        data
+                    )
+                else:
+                    # No history row, but current_inventory must still
+                    # reflect this check so its checked_at stays fresh
+                    self.db.record_current_inventory(
+                        plan_code,
+                        self.subsidiary,
+                        datacenter,
+                        datacenter_code,
+                        is_available,
+                        linux_status
+                    )
+
+                pending.append({
+                    "datacenter": datacenter,
+                    "is_available": is_available,
+                    "was_available": was_available,
+                    "out_of_stock_minutes": out_of_stock_minutes,
+                    "in_stock_minutes": in_stock_minutes,
+                })
+
+        # Phase 2: notifications are fired off as background tasks so one
+        # slow webhook never stalls the scan; _dispatch_notifications does
+        # its own logging and error containment.
+        for item in pending:
+            if len(self._notify_tasks) >= self.MAX_PENDING_NOTIFICATIONS:
+                # Backpressure: wait for one in-flight dispatch before
+                # queueing more instead of growing without bound
+                await asyncio.wait(self._notify_tasks, return_when=asyncio.FIRST_COMPLETED)
+            task = asyncio.create_task(
+                self._dispatch_notifications(plan_code, plan_info, notification_threshold, item)
             )
+            self._notify_tasks.add(task)
+            task.add_done_callback(self._notify_tasks.discard)
+
+    async def _dispatch_notifications(self, plan_code: str, plan_info, notification_threshold: int, item: Dict[str, Any]):
+        """Send the notifications for one datacenter's stock change."""
+        datacenter = item["datacenter"]
+        is_available = item["is_available"]
+        was_available = item["was_available"]
+        out_of_stock_minutes = item["out_of_stock_minutes"]
+        in_stock_minutes = item["in_stock_minutes"]
 
+        try:
             if is_available:
                 # Item is in stock now
                 if was_available is False:
-                    # It was out of stock, now it's back!
-                    out_of_stock_minutes = await self.db.mark_returned_to_stock(plan_code, datacenter, self.subsidiary)
-                    
-                    # Get notification threshold from database (allows dynamic updates)
-                    notification_threshold = await get_notification_threshold(self.db)
-                    
                     if out_of_stock_minutes and out_of_stock_minutes >= notification_threshold:
-                        # Send notifications to default webhook AND all subscribed users
-                        plan_info = await self.db.get_plan_info(plan_code, self.subsidiary)
-                        
                         # Skip notifications for legacy/non-orderable plans (they're only tracked for historical purposes)
                         if plan_info and not plan_info.get('is_orderable', True):
                             logger.info(f"[{self.subsidiary}] SKIP: {plan_code}/{datacenter} is not orderable (legacy plan), skipping notification")
-                            continue
-                        
+                            return
+
+                        # Send notifications to default webhook AND all subscribed users
                         results = await send_notifications_to_all(
                             self.db,
                             plan_code,
@@ -151,12 +341,12 @@ class OVHChecker:
                             plan_info=plan_info,
                             subsidiary=self.subsidiary
                         )
-                        
+
                         # Log results
                         default_result = results["default_webhook"]
                         user_count = len(results["user_webhooks"])
                         user_success = sum(1 for u in results["user_webhooks"] if u["success"])
-                        
+
                         logger.info(
                             f"[{self.subsidiary}] NOTIFY: {plan_code}/{datacenter} back in stock after {out_of_stock_minutes} min. "
                             f"Default: {'OK' if default_result['success'] else 'FAIL'}, "
@@ -167,21 +357,13 @@ class OVHChecker:
             else:
                 # Item is out of stock now
                 if was_available is True:
-                    # It was in stock, now it's gone!
-                    in_stock_minutes = await self.db.get_in_stock_duration(plan_code, datacenter, self.subsidiary)
-                    
-                    # Get notification threshold from database
-                    notification_threshold = await get_notification_threshold(self.db)
-                    
                     if in_stock_minutes and in_stock_minutes >= notification_threshold:
-                        # Send out-of-stock notifications
-                        plan_info = await self.db.get_plan_info(plan_code, self.subsidiary)
-                        
                         # Skip notifications for legacy/non-orderable plans (they're only tracked for historical purposes)
                         if plan_info and not plan_info.get('is_orderable', True):
                             logger.info(f"[{self.subsidiary}] SKIP: {plan_code}/{datacenter} is not orderable (legacy plan), skipping out-of-stock notification")
-                            continue
-                        
+                            return
+
+                        # Send out-of-stock notifications
                         results = await send_out_of_stock_notifications_to_all(
                             self.db,
                             plan_code,
@@ -190,12 +372,12 @@ class OVHChecker:
                             plan_info=plan_info,
                             subsidiary=self.subsidiary
                         )
-                        
+
                         # Log results
                         default_result = results["default_webhook"]
                         user_count = len(results["user_webhooks"])
                         user_success = sum(1 for u in results["user_webhooks"] if u["success"])
-                        
+
                         logger.info(
                             f"[{self.subsidiary}] NOTIFY: {plan_code}/{datacenter} out of stock after {in_stock_minutes} min. "
                             f"Default: {'OK' if default_result['success'] else 'FAIL'}, "
@@ -203,26 +385,62 @@ class OVHChecker:
                         )
                     elif in_stock_minutes:
                         logger.info(f"[{self.subsidiary}] INFO: {plan_code}/{datacenter} out of stock after {in_stock_minutes} min (below threshold)")
-                
-                # Track the out of stock event
-                await self.db.track_out_of_stock(plan_code, datacenter, self.subsidiary)
+        except Exception as e:
+            logger.error(f"[{self.subsidiary}] Error dispatching notifications for {plan_code}/{datacenter}: {e}")
 
-    async def run_check_cycle(self):
-        """Run a single check cycle for all monitored plans for this subsidiary."""
-        plans = await self.db.get_monitored_plans(self.subsidiary)
-        
-        logger.info(f"[{self.subsidiary}] Checking {len(plans)} plans...")
-        
-        for plan in plans:
+    async def drain_notifications(self):
+        """Wait for in-flight notification tasks (called on shutdown)."""
+        if self._notify_tasks:
+            logger.info(f"[{self.subsidiary}] Waiting for {len(self._notify_tasks)} pending notification(s)...")
+            await asyncio.gather(*self._notify_tasks, return_exceptions=True)
+
+    async def _safe_check(self, plan):
+        """Check one plan under the concurrency cap, containing per-plan errors."""
+        async with self.plan_semaphore:
             try:
                 await self.check_plan(plan["plan_code"], plan["url"])
             except Exception as e:
                 logger.error(f"[{self.subsidiary}] Error checking {plan['plan_code']}: {e}")
-            
+            # Hold the slot for a second so the sustained request rate against
+            # OVH stays at ~plan_concurrency requests per second
             await asyncio.sleep(1)
 
+    async def run_check_cycle(self):
+        """Run a single check cycle for all monitored plans for this subsidiary."""
+        # Seed (and hourly refresh) the known-datacenter set so the cycle
+        # skips upserts for location rows that already exist
+        now = time.monotonic()
+        if now - self._known_dcs_loaded_at >= self.DC_CACHE_RELOAD_SECONDS:
+            self._known_dcs = set(await self.db.get_all_datacenter_codes(self.subsidiary))
+            self._known_dcs_loaded_at = now
+
+        plans = await self.db.get_monitored_plans(self.subsidiary)
 
-async def get_check_interval(db: Database) -> int:
+        logger.info(f"[{self.subsidiary}] Checking {len(plans)} plans...")
+
+        # Plans hit independent OVH endpoints; overlap them instead of paying
+        # one round trip plus a sleep per plan sequentially
+        await asyncio.gather(*(self._safe_check(plan) for plan in plans))
+
+
+class TTLValue:
+    """Caches one async-loaded value for a short TTL so hot paths hit memory."""
+
+    def __init__(self, loader, ttl: float = 30.0):
+        self._loader = loader
+        self._ttl = ttl
+        self._value = None
+        self._expires_at = 0.0
+
+    async def get(self, db: Database):
+        now = time.monotonic()
+        if now >= self._expires_at:
+            self._value = await self._loader(db)
+            self._expires_at = now + self._ttl
+        return self._value
+
+
+async def _load_check_interval(db: Database) -> int:
     """Get check interval from database, falling back to env/default."""
     try:
         interval = await db.get_config("check_interval_seconds")
@@ -233,7 +451,7 @@ async def get_check_interval(db: Database) -> int:
     return settings.check_interval_seconds
 
 
-async def get_notification_threshold(db: Database) -> int:
+async def _load_notification_threshold(db: Database) -> int:
     """Get notification threshold from database, falling back to env/default."""
     try:
         threshold = await db.get_config("notification_threshold_minutes")
@@ -244,6 +462,20 @@ async def get_notification_threshold(db: Database) -> int:
     return settings.notification_threshold_minutes
 
 
+# These values change rarely but are read on every plan check / cycle, so
+# cache the parsed, clamped ints for a short window instead of re-fetching
+_interval_cache = TTLValue(_load_check_interval)
+_threshold_cache = TTLValue(_load_notification_threshold)
+
+
+async def get_check_interval(db: Database) -> int:
+    return await _interval_cache.get(db)
+
+
+async def get_notification_threshold(db: Database) -> int:
+    return await _threshold_cache.get(db)
+
+
 async def run_single_subsidiary_mode(db: Database, subsidiary: str):
     """
     Run checker for a single subsidiary.
@@ -282,54 +514,80 @@ async def run_single_subsidiary_mode(db: Database, subsidiary: str):
             await asyncio.sleep(check_interval)
     except asyncio.CancelledError:
         logger.info(f"[{agent_id}] Received shutdown signal")
+        await checker.drain_notifications()
         raise
 
 
+def _log_gather_failures(subsidiaries, results, what: str):
+    """Surface per-subsidiary exceptions swallowed by gather(return_exceptions=True)."""
+    for subsidiary, outcome in zip(subsidiaries, results):
+        if isinstance(outcome, BaseException):
+            logger.error(f"[{subsidiary}] {what} failed: {outcome!r}")
+
+
 async def run_multi_subsidiary_mode(db: Database):
     """
-    Run checker for all configured subsidiaries sequentially.
+    Run checker for all configured subsidiaries in parallel.
     Legacy mode - all subsidiaries in one process.
     """
     from catalog_fetcher import CatalogFetcher
-    
+
     # Get list of subsidiaries to monitor
     subsidiaries = await db.get_monitored_subsidiaries()
     logger.info(f"Monitoring subsidiaries: {', '.join(subsidiaries)}")
 
-    # Initial catalog sync for all subsidiaries
-    logger.info("Checking if catalog sync is needed for any subsidiary...")
-    for subsidiary in subsidiaries:
-        catalog_fetcher = CatalogFetcher(db, subsidiary)
+    # Build fetchers/checkers once and reuse them across cycles so their
+    # per-instance state (semaphores, sync timestamps) persists
+    catalog_fetchers = [CatalogFetcher(db, subsidiary) for subsidiary in subsidiaries]
+    checkers = [OVHChecker(db, subsidiary) for subsidiary in subsidiaries]
+
+    async def sync_catalog(catalog_fetcher, log_up_to_date=False):
         if await catalog_fetcher.should_sync_catalog():
-            logger.info(f"Syncing plans from OVH Order Catalog API for {subsidiary}...")
+            logger.info(f"Syncing plans from OVH Order Catalog API for {catalog_fetcher.subsidiary}...")
             result = await catalog_fetcher.discover_and_sync_plans()
-            logger.info(f"Catalog sync result for {subsidiary}: {result}")
-        else:
-            logger.info(f"Catalog for {subsidiary} is up to date")
+            logger.info(f"Catalog sync result for {catalog_fetcher.subsidiary}: {result}")
+        elif log_up_to_date:
+            logger.info(f"Catalog for {catalog_fetcher.subsidiary} is up to date")
+
+    # Initial catalog sync for all subsidiaries
+    logger.info("Checking if catalog sync is needed for any subsidiary...")
+    outcomes = await asyncio.gather(
+        *(sync_catalog(cf, log_up_to_date=True) for cf in catalog_fetchers),
+        return_exceptions=True
+    )
+    _log_gather_failures(subsidiaries, outcomes, "initial catalog sync")
 
     try:
         while True:
             logger.info("Starting check cycle for all subsidiaries...")
-            
-            # Run check cycle for each subsidiary
-            for subsidiary in subsidiaries:
-                checker = OVHChecker(db, subsidiary)
-                await checker.run_check_cycle()
-            
+
+            # Each subsidiary hits its own OVH endpoints; run them in parallel
+            # so cycle time is max(per-region) instead of the sum. One
+            # region failing (e.g. a DB outage mid-cycle) must not kill the
+            # others, but it also must not vanish silently.
+            outcomes = await asyncio.gather(
+                *(checker.run_check_cycle() for checker in checkers),
+                return_exceptions=True
+            )
+            _log_gather_failures(subsidiaries, outcomes, "check cycle")
+
             # Check if catalog needs sync (daily) for each subsidiary
-            for subsidiary in subsidiaries:
-                catalog_fetcher = CatalogFetcher(db, subsidiary)
-                if await catalog_fetcher.should_sync_catalog():
-                    logger.info(f"Daily catalog sync triggered for {subsidiary}...")
-                    result = await catalog_fetcher.discover_and_sync_plans()
-                    logger.info(f"Catalog sync result for {subsidiary}: {result}")
-            
+            outcomes = await asyncio.gather(
+                *(sync_catalog(cf) for cf in catalog_fetchers),
+                return_exceptions=True
+            )
+            _log_gather_failures(subsidiaries, outcomes, "catalog sync")
+
             # Get current check interval from database (allows dynamic updates)
             check_interval = await get_check_interval(db)
             logger.info(f"Check cycle complete. Sleeping for {check_interval} seconds...")
             await asyncio.sleep(check_interval)
     except asyncio.CancelledError:
         logger.info("Received shutdown signal")
+        await asyncio.gather(
+            *(checker.drain_notifications() for checker in checkers),
+            return_exceptions=True
+        )
         raise
 
 
@@ -341,6 +599,7 @@ async def main():
         mode = "Multi-Subsidiary Mode (all regions)"
     
     logger.info(f"Starting OVH Inventory Checker - {mode}")
+    logger.info(f"Event loop: {'uvloop' if uvloop else 'asyncio (default)'}")
     
     # Initialize database schema (creates tables if they don't exist)
     logger.info("Initializing database schema...")
@@ -361,6 +620,8 @@ async def main():
     except KeyboardInterrupt:
         logger.info("Shutting down...")
     finally:
+        await close_webhook_session()
+        await close_session()
         await db.disconnect()
 
 
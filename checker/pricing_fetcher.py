@@ -1,8 +1,15 @@
-import aiohttp
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 from catalog_fetcher import get_catalog_url
+from http_client import get_session, json_loads, NOT_MODIFIED
+
+# ijson lets the pricing update stream the multi-MB catalog and only
+# materialize monitored plans; fall back to whole-document parsing
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 logger = logging.getLogger(__name__)
 
@@ -12,24 +19,42 @@ MICROCENTS_DIVISOR = 100_000_000  # OVH prices are in microcents
 class PricingFetcher:
     def __init__(self, db):
         self.db = db
+        # Last seen catalog ETag for conditional GETs
+        self._catalog_etag: Optional[str] = None
 
     async def fetch_catalog(self) -> Optional[Dict[str, Any]]:
-        """Fetch the VPS catalog from OVH API."""
+        """
+        Fetch the VPS catalog from OVH API.
+
+        Returns the NOT_MODIFIED sentinel when OVH replies 304 to the
+        cached ETag (the catalog changes daily at most).
+        """
         try:
             # Get subsidiary from config (US, FR, CA, etc.), default to US
             subsidiary = await self.db.get_config("ovh_subsidiary") or "US"
             catalog_url = get_catalog_url(subsidiary)
             logger.info(f"Fetching catalog for subsidiary: {subsidiary}")
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(catalog_url, timeout=60) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        logger.info(f"Fetched catalog with {len(data.get('plans', []))} plans")
-                        return data
-                    else:
-                        logger.error(f"OVH Catalog API returned {response.status}")
-                        return None
+
+            headers = {}
+            if self._catalog_etag:
+                headers["If-None-Match"] = self._catalog_etag
+
+            async with get_session().get(catalog_url, headers=headers) as response:
+                if response.status == 304:
+                    logger.info("Catalog unchanged since last fetch (304)")
+                    return NOT_MODIFIED
+                if response.status == 200:
+                    data = json_loads(await response.read())
+                    # See _build_rows_streaming: the ETag is only cached
+                    # after the body has parsed successfully
+                    etag = response.headers.get("ETag")
+                    if etag:
+                        self._catalog_etag = etag
+                    logger.info(f"Fetched catalog with {len(data.get('plans', []))} plans")
+                    return data
+                else:
+                    logger.error(f"OVH Catalog API returned {response.status}")
+                    return None
         except Exception as e:
             logger.error(f"Error fetching catalog: {e}")
             return None
@@ -74,46 +99,126 @@ class PricingFetcher:
 
         return results
 
+    def _append_pricing_rows(self, rows: List[Dict[str, Any]], plan_data: Dict[str, Any],
+                             subsidiary: str, currency: str):
+        """Append bulk-upsert rows for one plan's pricing tiers."""
+        for tier in self.extract_pricing(plan_data):
+            rows.append({
+                "plan_code": tier["plan_code"],
+                "subsidiary": subsidiary,
+                # int() also normalizes ijson's Decimal numbers
+                "commitment_months": int(tier["commitment_months"]),
+                "price_microcents": int(tier["price_microcents"]),
+                "currency": currency,
+                "description": tier["description"]
+            })
+
+    async def _build_rows_streaming(self, subsidiary: str, monitored_codes) -> Optional[List[Dict[str, Any]]]:
+        """
+        Build pricing rows by stream-parsing the catalog with ijson.
+
+        Only monitored plans are ever materialized, so peak memory stays
+        at one plan dict instead of the full catalog tree. Returns the row
+        list, NOT_MODIFIED on a 304, or None on failure.
+        """
+        catalog_url = get_catalog_url(subsidiary)
+        logger.info(f"Streaming catalog for subsidiary: {subsidiary}")
+
+        headers = {}
+        if self._catalog_etag:
+            headers["If-None-Match"] = self._catalog_etag
+
+        try:
+            async with get_session().get(catalog_url, headers=headers) as response:
+                if response.status == 304:
+                    logger.info("Catalog unchanged since last fetch (304)")
+                    return NOT_MODIFIED
+                if response.status != 200:
+                    logger.error(f"OVH Catalog API returned {response.status}")
+                    return None
+                etag = response.headers.get("ETag")
+
+                rows: List[Dict[str, Any]] = []
+                currency = None
+                builder = None
+                async for prefix, event, value in ijson.parse_async(response.content):
+                    if prefix == "locale.currencyCode":
+                        currency = value
+                    elif prefix == "plans.item" and event == "start_map":
+                        builder = ijson.ObjectBuilder()
+                        builder.event(event, value)
+                    elif builder is not None:
+                        builder.event(event, value)
+                        if prefix == "plans.item" and event == "end_map":
+                            plan, builder = builder.value, None
+                            if plan.get("planCode") in monitored_codes and plan.get("pricings"):
+                                self._append_pricing_rows(rows, plan, subsidiary, None)
+                # locale may appear before or after the plans array in the
+                # stream, so the currency is backfilled only once the whole
+                # document has been parsed
+                currency = currency or "USD"
+                for row in rows:
+                    row["currency"] = currency
+                # Cache the ETag only now that the stream parsed cleanly; a
+                # mid-stream failure must not make the next poll a 304 for
+                # a catalog that was never processed
+                if etag:
+                    self._catalog_etag = etag
+                return rows
+        except Exception as e:
+            logger.error(f"Error streaming catalog: {e}")
+            return None
+
     async def update_pricing(self) -> bool:
         """
         Fetch catalog and update pricing for all monitored plans.
         Returns True if successful.
         """
         logger.info("Starting pricing update...")
-        
-        catalog = await self.fetch_catalog()
-        if not catalog:
-            logger.error("Failed to fetch catalog")
-            return False
 
         # Get monitored plan codes
         monitored_plans = await self.db.get_monitored_plans()
-        monitored_codes = {p["plan_code"] for p in monitored_plans}
+        monitored_codes = frozenset(p["plan_code"] for p in monitored_plans)
         logger.info(f"Updating pricing for {len(monitored_codes)} monitored plans")
 
-        plans = catalog.get("plans", [])
-        updated_count = 0
-        
-        for plan_data in plans:
-            plan_code = plan_data.get("planCode", "")
-            
-            # Only process plans we're monitoring
-            if plan_code not in monitored_codes:
-                continue
+        subsidiary = await self.db.get_config("ovh_subsidiary") or "US"
 
-            pricing_tiers = self.extract_pricing(plan_data)
-            
-            for tier in pricing_tiers:
-                try:
-                    await self.db.save_pricing(
-                        plan_code=tier["plan_code"],
-                        commitment_months=tier["commitment_months"],
-                        price_microcents=tier["price_microcents"],
-                        description=tier["description"]
-                    )
-                    updated_count += 1
-                except Exception as e:
-                    logger.error(f"Error saving pricing for {plan_code}: {e}")
+        if ijson is not None:
+            rows = await self._build_rows_streaming(subsidiary, monitored_codes)
+        else:
+            catalog = await self.fetch_catalog()
+            if catalog is NOT_MODIFIED:
+                rows = NOT_MODIFIED
+            elif not catalog:
+                rows = None
+            else:
+                currency = catalog.get("locale", {}).get("currencyCode", "USD")
+                rows = []
+                # Filter to monitored plans that actually carry pricing data
+                for plan_data in catalog.get("plans", []):
+                    if plan_data.get("planCode") in monitored_codes and plan_data.get("pricings"):
+                        self._append_pricing_rows(rows, plan_data, subsidiary, currency)
+
+        if rows is NOT_MODIFIED:
+            # Prices can't have changed; just refresh the timestamp
+            await self.db.set_config(
+                "pricing_last_updated",
+                datetime.now(timezone.utc).isoformat()
+            )
+            logger.info("Pricing update skipped; catalog unchanged")
+            return True
+        if rows is None:
+            logger.error("Failed to fetch catalog")
+            return False
+
+        try:
+            updated_count = await self.db.save_pricing_bulk(rows)
+        except Exception as e:
+            logger.error(f"Error saving pricing rows: {e}")
+            # Drop the cached ETag so the next cycle refetches instead of
+            # treating the unsaved catalog as already handled via a 304
+            self._catalog_etag = None
+            return False
 
         # Update last pricing update timestamp
         await self.db.set_config(
@@ -2,15 +2,142 @@
 Unified notification client supporting Discord and Slack webhooks.
 """
 import aiohttp
+import asyncio
 import ipaddress
 import logging
+import random
 import socket
-from typing import Dict, Any, Optional, Tuple
+import time
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import urlparse
 from datetime import datetime, timezone
 
+from http_client import json_dumps
+
 logger = logging.getLogger(__name__)
 
+# Transient-failure retry policy for webhook posts
+RETRY_ATTEMPTS = 3
+RETRY_BASE_SECONDS = 0.5
+RETRY_MAX_SLEEP_SECONDS = 30.0
+
+# Cap on in-flight posts per webhook host. Discord and Slack rate-limit
+# per endpoint, so an unbounded fan-out just converts into a pile of 429
+# retries; queueing above this limit is cheaper than retrying.
+HOST_CONCURRENCY = 16
+_host_sems: Dict[str, asyncio.Semaphore] = {}
+
+
+@lru_cache(maxsize=1024)
+def _parse_webhook(url: str) -> Tuple[str, str, str]:
+    """
+    Parse a webhook URL once: (scheme, hostname, detected service type).
+
+    urlparse is a pure-Python state machine and the checker feeds the
+    same few URLs through it every cycle, so the parsed pieces are
+    memoized and shared by type detection, validation, and the per-host
+    semaphore lookup.
+    """
+    parsed = urlparse(url)
+    host = (parsed.hostname or '').lower()
+    webhook_type = 'unknown'
+    if host:
+        for known in WebhookNotifier.DISCORD_HOSTS:
+            if host == known or host.endswith('.' + known):
+                webhook_type = 'discord'
+                break
+        else:
+            for known in WebhookNotifier.SLACK_HOSTS:
+                if host == known or host.endswith('.' + known):
+                    webhook_type = 'slack'
+                    break
+    return parsed.scheme, host, webhook_type
+
+
+def _get_host_semaphore(url: str) -> asyncio.Semaphore:
+    """Semaphore bounding concurrent posts to this URL's host."""
+    host = _parse_webhook(url)[1]
+    sem = _host_sems.get(host)
+    if sem is None:
+        sem = _host_sems.setdefault(host, asyncio.Semaphore(HOST_CONCURRENCY))
+    return sem
+
+
+# Stock-change coalescing: when several plans flip state in the same
+# check cycle, posts headed for the same webhook are merged into one
+# multi-embed (Discord) / multi-section (Slack) message instead of N
+# HTTPS round-trips. Messages wait at most the window below; a full
+# batch flushes immediately.
+BATCH_WINDOW_SECONDS = 2.0
+# Discord caps embeds at 10 per message; Slack caps blocks at 50 and
+# each stock message plus divider runs about 7 blocks
+_BATCH_MAX_MESSAGES = {"Discord": 10, "Slack": 7}
+
+
+class _PendingBatch:
+    """Payloads accumulated for one webhook URL, awaiting a shared flush."""
+
+    def __init__(self, service_name: str):
+        self.service_name = service_name
+        self.payloads: List[Dict[str, Any]] = []
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.flush_task: Optional[asyncio.Task] = None
+
+
+_pending_batches: Dict[str, _PendingBatch] = {}
+
+
+def _combine_discord_payloads(payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge single-embed Discord payloads into one multi-embed message."""
+    combined = {k: v for k, v in payloads[0].items() if k not in ("embeds", "content")}
+    combined["embeds"] = [e for p in payloads for e in p.get("embeds", [])]
+    # Deduplicate role mentions across the batch, keeping order
+    contents = list(dict.fromkeys(p["content"] for p in payloads if p.get("content")))
+    if contents:
+        combined["content"] = " ".join(contents)
+    return combined
+
+
+def _combine_slack_payloads(payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge Slack block-kit payloads into one divider-separated message."""
+    combined = {k: v for k, v in payloads[0].items() if k not in ("blocks", "text")}
+    blocks: List[Dict[str, Any]] = []
+    for i, p in enumerate(payloads):
+        if i:
+            blocks.append({"type": "divider"})
+        blocks.extend(p.get("blocks", []))
+    combined["blocks"] = blocks
+    combined["text"] = "\n".join(p.get("text", "") for p in payloads)
+    return combined
+
+
+async def _flush_batch(url: str, batch: _PendingBatch):
+    """Post one combined message for the batch and wake all enqueuers."""
+    if len(batch.payloads) == 1:
+        payload = batch.payloads[0]
+    elif batch.service_name == "Discord":
+        payload = _combine_discord_payloads(batch.payloads)
+    else:
+        payload = _combine_slack_payloads(batch.payloads)
+    if len(batch.payloads) > 1:
+        logger.info(
+            f"Coalesced {len(batch.payloads)} {batch.service_name} notifications into one post"
+        )
+    result = await WebhookNotifier._post_webhook(url, payload, batch.service_name)
+    batch.future.set_result(result)
+
+
+async def _flush_batch_after_window(url: str, batch: _PendingBatch):
+    try:
+        await asyncio.sleep(BATCH_WINDOW_SECONDS)
+    except asyncio.CancelledError:
+        return
+    # pop-if-ours claims the batch; the size-triggered flush uses the
+    # same claim, so exactly one path posts it
+    if _pending_batches.pop(url, None) is batch:
+        await _flush_batch(url, batch)
+
 
 def _is_private_ip(ip_str: str) -> bool:
     """Check if an IP address is private, loopback, or otherwise internal."""
@@ -29,66 +156,184 @@ def _is_private_ip(ip_str: str) -> bool:
         return True
 
 
-def _resolve_and_validate_host(hostname: str) -> Tuple[bool, str]:
+# Validation results per hostname, cached for a short TTL so repeated
+# checks against the same few Discord/Slack hosts skip the resolver
+_DNS_CACHE_TTL_SECONDS = 300
+_dns_cache: Dict[str, Tuple[float, bool, str]] = {}
+
+
+async def _resolve_and_validate_host(hostname: str) -> Tuple[bool, str]:
     """
     Resolve hostname and validate that it doesn't point to internal IPs.
-    Returns (is_safe, error_message).
+    Returns (is_safe, error_message). Results are cached per hostname for
+    a short TTL.
+
+    Resolution goes through the event loop's threadpool resolver so a
+    slow DNS query never blocks concurrent webhook sends.
     """
+    cached = _dns_cache.get(hostname)
+    if cached and cached[0] > time.monotonic():
+        return cached[1], cached[2]
+
     try:
-        # Resolve all IPs for the hostname
-        results = socket.getaddrinfo(hostname, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
+        # Resolve all IPs for the hostname; pinning proto to TCP and asking
+        # only for configured address families keeps libc from returning
+        # each address several times (once per protocol/flags combo)
+        results = await asyncio.get_running_loop().getaddrinfo(
+            hostname, None,
+            family=socket.AF_UNSPEC,
+            type=socket.SOCK_STREAM,
+            proto=socket.IPPROTO_TCP,
+            flags=socket.AI_ADDRCONFIG,
+        )
+        is_safe, error = True, ""
         for family, _, _, _, sockaddr in results:
             ip_str = sockaddr[0]
             if _is_private_ip(ip_str):
-                return False, f"Webhook URL resolves to private/internal IP: {ip_str}"
-        return True, ""
+                is_safe, error = False, f"Webhook URL resolves to private/internal IP: {ip_str}"
+                break
     except socket.gaierror as e:
+        # Don't cache resolver failures; they're usually transient
         return False, f"Failed to resolve webhook hostname: {e}"
 
+    _dns_cache[hostname] = (time.monotonic() + _DNS_CACHE_TTL_SECONDS, is_safe, error)
+    return is_safe, error
+
+
+class _PublicOnlyResolver(aiohttp.resolver.ThreadedResolver):
+    """
+    Resolver that refuses private/internal addresses.
+
+    Webhook URLs are user-supplied, and the registration-time SSRF check
+    leaves a DNS-rebinding window between validate and connect. Checking
+    the addresses the connector actually dials closes that race, and the
+    connector's DNS cache means no second lookup per post.
+    """
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        hosts = await super().resolve(host, port, family)
+        for entry in hosts:
+            if _is_private_ip(entry["host"]):
+                raise OSError(
+                    f"Refusing connection: {host} resolves to private/internal IP {entry['host']}"
+                )
+        return hosts
+
+
+_webhook_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_webhook_session() -> aiohttp.ClientSession:
+    """
+    Shared session for webhook posts.
+
+    Separate from the general OVH session so its resolver can re-validate
+    addresses at connect time; DNS results are cached on the connector.
+    """
+    global _webhook_session
+    if _webhook_session is None or _webhook_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=32,
+            ttl_dns_cache=300,
+            resolver=_PublicOnlyResolver(),
+        )
+        _webhook_session = aiohttp.ClientSession(
+            connector=connector,
+            json_serialize=json_dumps,
+        )
+    return _webhook_session
+
+
+async def close_webhook_session():
+    """Close the shared webhook session (called on process shutdown)."""
+    global _webhook_session
+    if _webhook_session is not None and not _webhook_session.closed:
+        await _webhook_session.close()
+    _webhook_session = None
+
+
+# Invariant payload scaffolding, built once at import; send paths only
+# fill in the dynamic fields
+_DISCORD_TEST_EMBED_TEMPLATE = {
+    "title": "🧪 Test Notification",
+    "description": "This is a test notification from OVH Inventory Checker",
+    "color": 3447003,  # Blue
+    "footer": {"text": "OVH Inventory Checker - Test Message"},
+}
+
+_SLACK_TEST_BLOCKS_HEAD = (
+    {
+        "type": "header",
+        "text": {
+            "type": "plain_text",
+            "text": "🧪 Test Notification",
+            "emoji": True
+        }
+    },
+    {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": "This is a test notification from *OVH Inventory Checker*"
+        }
+    },
+)
+
+_SLACK_TEST_CONTEXT_BLOCK = {
+    "type": "context",
+    "elements": [
+        {
+            "type": "mrkdwn",
+            "text": "OVH Inventory Checker - Test Message"
+        }
+    ]
+}
+
 
 class WebhookNotifier:
     """Unified webhook notifier for Discord and Slack."""
-    
-    DISCORD_HOSTS = ('discord.com', 'discordapp.com')
-    SLACK_HOSTS = ('hooks.slack.com',)
-    
+
+    DISCORD_HOSTS = frozenset({'discord.com', 'discordapp.com'})
+    SLACK_HOSTS = frozenset({'hooks.slack.com'})
+
     @staticmethod
     def detect_webhook_type(url: str) -> str:
-        """Detect webhook type from URL."""
+        """
+        Detect webhook type from the URL's hostname.
+
+        Matches the parsed hostname (including subdomains) against the
+        known host sets rather than substring-scanning the whole URL, so
+        a crafted path like /discord.com/ can't spoof the type. Parsing
+        and matching are memoized in _parse_webhook.
+        """
         if not url:
             return 'unknown'
-        url_lower = url.lower()
-        if any(host in url_lower for host in WebhookNotifier.DISCORD_HOSTS):
-            return 'discord'
-        elif any(host in url_lower for host in WebhookNotifier.SLACK_HOSTS):
-            return 'slack'
-        return 'unknown'
+        return _parse_webhook(url)[2]
     
     @staticmethod
-    def validate_webhook_url(url: str, webhook_type: str = None) -> Tuple[bool, str]:
+    async def validate_webhook_url(url: str, webhook_type: str = None) -> Tuple[bool, str]:
         """Validate webhook URL format and check for SSRF vulnerabilities."""
         if not url:
             return False, "Webhook URL is required"
-        
-        if not url.startswith('https://'):
+
+        scheme, hostname, detected_type = _parse_webhook(url)
+
+        if scheme != 'https':
             return False, "Webhook URL must use HTTPS"
-        
-        detected_type = WebhookNotifier.detect_webhook_type(url)
-        
+
         if webhook_type and detected_type != webhook_type:
             return False, f"URL does not match webhook type '{webhook_type}'"
-        
+
         if detected_type == 'unknown':
             return False, "URL must be a valid Discord or Slack webhook URL"
-        
+
         # SSRF Protection: Validate that the URL doesn't resolve to internal IPs
         try:
-            parsed = urlparse(url)
-            hostname = parsed.hostname
             if not hostname:
                 return False, "Invalid webhook URL: no hostname"
-            
-            is_safe, error_msg = _resolve_and_validate_host(hostname)
+
+            is_safe, error_msg = await _resolve_and_validate_host(hostname)
             if not is_safe:
                 logger.warning(f"SSRF protection blocked webhook URL: {error_msg}")
                 return False, f"Invalid webhook URL: {error_msg}"
@@ -174,16 +419,14 @@ class WebhookNotifier:
     @staticmethod
     async def _send_discord_test(webhook_url: str, bot_username: str = None) -> Tuple[bool, str]:
         """Send a test Discord notification."""
+        now = datetime.now(timezone.utc)
         embed = {
-            "title": "🧪 Test Notification",
-            "description": "This is a test notification from OVH Inventory Checker",
-            "color": 3447003,  # Blue
+            **_DISCORD_TEST_EMBED_TEMPLATE,
             "fields": [
                 {"name": "Status", "value": "✅ Webhook is working correctly!", "inline": False},
-                {"name": "Timestamp", "value": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC"), "inline": False}
+                {"name": "Timestamp", "value": now.strftime("%Y-%m-%d %H:%M:%S UTC"), "inline": False}
             ],
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "footer": {"text": "OVH Inventory Checker - Test Message"}
+            "timestamp": now.isoformat(),
         }
 
         payload = {
@@ -194,39 +437,31 @@ class WebhookNotifier:
         return await WebhookNotifier._post_webhook(webhook_url, payload, "Discord")
 
     @staticmethod
-    async def _send_discord_notification(
-        webhook_url: str,
+    def build_stock_embed(
         plan_code: str,
         datacenter: str,
         out_of_stock_minutes: int,
         plan_info: Optional[Dict[str, Any]] = None,
-        subsidiary: str = 'US',
-        bot_username: str = None,
-        webhook_name: str = None,
-        mention_role_id: str = None,
-        embed_color: str = None,
-        **kwargs
-    ) -> Tuple[bool, Optional[str]]:
-        """Send a Discord stock notification."""
+        subsidiary: str = 'US'
+    ) -> Dict[str, Any]:
+        """
+        Build the Discord embed for a back-in-stock event.
+
+        The embed is identical for every recipient of the same event apart
+        from color and footer, so fan-out callers can build it once and pass
+        it to each send as prebuilt_embed.
+        """
         from catalog_fetcher import get_purchase_url, get_subsidiary_name
-        
+
         display_name = plan_info.get("display_name", plan_code) if plan_info else plan_code
         price = plan_info.get("price", "N/A") if plan_info else "N/A"
         purchase_url = plan_info.get("purchase_url", get_purchase_url(subsidiary)) if plan_info else get_purchase_url(subsidiary)
         subsidiary_name = get_subsidiary_name(subsidiary)
-        
-        # Parse embed color
-        color = 5763719  # Default green
-        if embed_color:
-            try:
-                color = int(embed_color.lstrip('#'), 16)
-            except ValueError:
-                pass
-        
-        embed = {
+
+        return {
             "title": f"🟢 VPS Back in Stock! ({subsidiary})",
             "description": f"**{display_name}** is now available in {subsidiary_name}!",
-            "color": color,
+            "color": 5763719,  # Default green
             "fields": [
                 {"name": "Plan", "value": plan_code, "inline": True},
                 {"name": "Datacenter", "value": datacenter, "inline": True},
@@ -236,9 +471,42 @@ class WebhookNotifier:
                 {"name": "Order Now", "value": f"[Click here to order]({purchase_url})", "inline": False}
             ],
             "timestamp": datetime.now(timezone.utc).isoformat(),
-            "footer": {"text": f"OVH Inventory Checker • {webhook_name or subsidiary_name}"}
+            "footer": {"text": f"OVH Inventory Checker • {subsidiary_name}"}
         }
 
+    @staticmethod
+    async def _send_discord_notification(
+        webhook_url: str,
+        plan_code: str,
+        datacenter: str,
+        out_of_stock_minutes: int,
+        plan_info: Optional[Dict[str, Any]] = None,
+        subsidiary: str = 'US',
+        bot_username: str = None,
+        webhook_name: str = None,
+        mention_role_id: str = None,
+        embed_color: str = None,
+        prebuilt_embed: Optional[Dict[str, Any]] = None,
+        **kwargs
+    ) -> Tuple[bool, Optional[str]]:
+        """Send a Discord stock notification."""
+        # Reuse the shared skeleton when fanning out; a shallow copy is
+        # enough since only color and footer differ per recipient
+        if prebuilt_embed is not None:
+            embed = {**prebuilt_embed}
+        else:
+            embed = WebhookNotifier.build_stock_embed(
+                plan_code, datacenter, out_of_stock_minutes, plan_info, subsidiary
+            )
+
+        if embed_color:
+            try:
+                embed["color"] = int(embed_color.lstrip('#'), 16)
+            except ValueError:
+                pass
+        if webhook_name:
+            embed["footer"] = {"text": f"OVH Inventory Checker • {webhook_name}"}
+
         content = None
         if mention_role_id:
             content = f"<@&{mention_role_id}>"
@@ -250,7 +518,35 @@ class WebhookNotifier:
         if content:
             payload["content"] = content
 
-        return await WebhookNotifier._post_webhook(webhook_url, payload, "Discord")
+        return await WebhookNotifier._post_webhook_batched(webhook_url, payload, "Discord")
+
+    @staticmethod
+    def build_out_of_stock_embed(
+        plan_code: str,
+        datacenter: str,
+        in_stock_minutes: int,
+        plan_info: Optional[Dict[str, Any]] = None,
+        subsidiary: str = 'US'
+    ) -> Dict[str, Any]:
+        """Build the Discord embed for an out-of-stock event (see build_stock_embed)."""
+        from catalog_fetcher import get_subsidiary_name
+
+        display_name = plan_info.get("display_name", plan_code) if plan_info else plan_code
+        subsidiary_name = get_subsidiary_name(subsidiary)
+
+        return {
+            "title": f"🔴 VPS Out of Stock ({subsidiary})",
+            "description": f"**{display_name}** is no longer available in {subsidiary_name}.",
+            "color": 15158332,  # Default red
+            "fields": [
+                {"name": "Plan", "value": plan_code, "inline": True},
+                {"name": "Datacenter", "value": datacenter, "inline": True},
+                {"name": "Region", "value": subsidiary_name, "inline": True},
+                {"name": "Was In Stock For", "value": f"{in_stock_minutes} minutes", "inline": True},
+            ],
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "footer": {"text": f"OVH Inventory Checker • {subsidiary_name}"}
+        }
 
     @staticmethod
     async def _send_discord_out_of_stock(
@@ -264,35 +560,26 @@ class WebhookNotifier:
         webhook_name: str = None,
         mention_role_id: str = None,
         embed_color: str = None,
+        prebuilt_embed: Optional[Dict[str, Any]] = None,
         **kwargs
     ) -> Tuple[bool, Optional[str]]:
         """Send a Discord out-of-stock notification."""
-        from catalog_fetcher import get_subsidiary_name
-        
-        display_name = plan_info.get("display_name", plan_code) if plan_info else plan_code
-        subsidiary_name = get_subsidiary_name(subsidiary)
-        
-        # Use red/orange color for out of stock
-        color = 15158332  # Default red
+        # Reuse the shared skeleton when fanning out; a shallow copy is
+        # enough since only color and footer differ per recipient
+        if prebuilt_embed is not None:
+            embed = {**prebuilt_embed}
+        else:
+            embed = WebhookNotifier.build_out_of_stock_embed(
+                plan_code, datacenter, in_stock_minutes, plan_info, subsidiary
+            )
+
         if embed_color:
             try:
-                color = int(embed_color.lstrip('#'), 16)
+                embed["color"] = int(embed_color.lstrip('#'), 16)
             except ValueError:
                 pass
-        
-        embed = {
-            "title": f"🔴 VPS Out of Stock ({subsidiary})",
-            "description": f"**{display_name}** is no longer available in {subsidiary_name}.",
-            "color": color,
-            "fields": [
-                {"name": "Plan", "value": plan_code, "inline": True},
-                {"name": "Datacenter", "value": datacenter, "inline": True},
-                {"name": "Region", "value": subsidiary_name, "inline": True},
-                {"name": "Was In Stock For", "value": f"{in_stock_minutes} minutes", "inline": True},
-            ],
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "footer": {"text": f"OVH Inventory Checker • {webhook_name or subsidiary_name}"}
-        }
+        if webhook_name:
+            embed["footer"] = {"text": f"OVH Inventory Checker • {webhook_name}"}
 
         content = None
         if mention_role_id:
@@ -305,7 +592,7 @@ class WebhookNotifier:
         if content:
             payload["content"] = content
 
-        return await WebhookNotifier._post_webhook(webhook_url, payload, "Discord")
+        return await WebhookNotifier._post_webhook_batched(webhook_url, payload, "Discord")
 
     # ========== Slack Implementation ==========
     
@@ -313,21 +600,7 @@ class WebhookNotifier:
     async def _send_slack_test(webhook_url: str, bot_username: str = None) -> Tuple[bool, str]:
         """Send a test Slack notification."""
         blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": "🧪 Test Notification",
-                    "emoji": True
-                }
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "This is a test notification from *OVH Inventory Checker*"
-                }
-            },
+            *_SLACK_TEST_BLOCKS_HEAD,
             {
                 "type": "section",
                 "fields": [
@@ -341,15 +614,7 @@ class WebhookNotifier:
                     }
                 ]
             },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": "OVH Inventory Checker - Test Message"
-                    }
-                ]
-            }
+            _SLACK_TEST_CONTEXT_BLOCK
         ]
 
         payload = {
@@ -381,7 +646,8 @@ class WebhookNotifier:
         price = plan_info.get("price", "N/A") if plan_info else "N/A"
         purchase_url = plan_info.get("purchase_url", get_purchase_url(subsidiary)) if plan_info else get_purchase_url(subsidiary)
         subsidiary_name = get_subsidiary_name(subsidiary)
-        
+        now = datetime.now(timezone.utc)
+
         blocks = [
             {
                 "type": "header",
@@ -434,7 +700,7 @@ class WebhookNotifier:
                 "elements": [
                     {
                         "type": "mrkdwn",
-                        "text": f"OVH Inventory Checker • {webhook_name or subsidiary_name} • <!date^{int(datetime.now(timezone.utc).timestamp())}^{{date_short_pretty}} at {{time}}|{datetime.now(timezone.utc).isoformat()}>"
+                        "text": f"OVH Inventory Checker • {webhook_name or subsidiary_name} • <!date^{int(now.timestamp())}^{{date_short_pretty}} at {{time}}|{now.isoformat()}>"
                     }
                 ]
             }
@@ -449,7 +715,7 @@ class WebhookNotifier:
         if slack_channel:
             payload["channel"] = slack_channel
 
-        return await WebhookNotifier._post_webhook(webhook_url, payload, "Slack")
+        return await WebhookNotifier._post_webhook_batched(webhook_url, payload, "Slack")
 
     @staticmethod
     async def _send_slack_out_of_stock(
@@ -466,10 +732,11 @@ class WebhookNotifier:
     ) -> Tuple[bool, Optional[str]]:
         """Send a Slack out-of-stock notification."""
         from catalog_fetcher import get_subsidiary_name
-        
+
         display_name = plan_info.get("display_name", plan_code) if plan_info else plan_code
         subsidiary_name = get_subsidiary_name(subsidiary)
-        
+        now = datetime.now(timezone.utc)
+
         blocks = [
             {
                 "type": "header",
@@ -500,7 +767,7 @@ class WebhookNotifier:
                 "elements": [
                     {
                         "type": "mrkdwn",
-                        "text": f"OVH Inventory Checker • {webhook_name or subsidiary_name} • <!date^{int(datetime.now(timezone.utc).timestamp())}^{{date_short_pretty}} at {{time}}|{datetime.now(timezone.utc).isoformat()}>"
+                        "text": f"OVH Inventory Checker • {webhook_name or subsidiary_name} • <!date^{int(now.timestamp())}^{{date_short_pretty}} at {{time}}|{now.isoformat()}>"
                     }
                 ]
             }
@@ -515,37 +782,102 @@ class WebhookNotifier:
         if slack_channel:
             payload["channel"] = slack_channel
 
-        return await WebhookNotifier._post_webhook(webhook_url, payload, "Slack")
+        return await WebhookNotifier._post_webhook_batched(webhook_url, payload, "Slack")
 
     # ========== Common HTTP Posting ==========
-    
+
+    @staticmethod
+    async def _post_webhook_batched(url: str, payload: Dict, service_name: str) -> Tuple[bool, str]:
+        """
+        Post via a short coalescing window so concurrent stock changes
+        aimed at the same webhook go out as one combined message.
+
+        The first enqueuer for a URL opens a batch and arms a flush
+        timer; later enqueuers within the window piggyback on it. All
+        of them await the same future and get the combined post's
+        result. Used by stock/out-of-stock sends; tests post directly.
+        """
+        batch = _pending_batches.get(url)
+        if batch is not None and batch.service_name != service_name:
+            # A URL only ever serves one service; don't mix payload shapes
+            return await WebhookNotifier._post_webhook(url, payload, service_name)
+        if batch is None:
+            batch = _PendingBatch(service_name)
+            _pending_batches[url] = batch
+            batch.flush_task = asyncio.create_task(_flush_batch_after_window(url, batch))
+        batch.payloads.append(payload)
+
+        if len(batch.payloads) >= _BATCH_MAX_MESSAGES[service_name]:
+            if _pending_batches.pop(url, None) is batch:
+                batch.flush_task.cancel()
+                await _flush_batch(url, batch)
+
+        return await asyncio.shield(batch.future)
+
     @staticmethod
     async def _post_webhook(url: str, payload: Dict, service_name: str) -> Tuple[bool, str]:
-        """Post payload to webhook URL."""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
+        """
+        Post payload to webhook URL, retrying transient failures.
+
+        429s honor the Retry-After header; 5xx and connection errors back
+        off exponentially with jitter. Other statuses fail immediately so
+        permanent errors (bad URL, revoked webhook) don't stall the cycle.
+        """
+        # Serialize once up front (orjson when available) instead of
+        # letting aiohttp re-serialize with stdlib json
+        body = json_dumps(payload)
+        error_msg = f"Failed to send {service_name} notification"
+        # Held only around the request itself so backoff sleeps don't
+        # keep a slot occupied
+        host_sem = _get_host_semaphore(url)
+
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                async with host_sem, get_webhook_session().post(
                     url,
-                    json=payload,
+                    data=body,
                     headers={"Content-Type": "application/json"},
                     timeout=aiohttp.ClientTimeout(total=10)
                 ) as response:
                     if response.status in (200, 204):
+                        # Nothing useful in the body (Discord sends 204,
+                        # Slack a tiny "ok"); hand the connection back to
+                        # the pool without buffering it
+                        response.release()
                         logger.info(f"{service_name} notification sent successfully")
                         return True, f"{service_name} notification sent successfully!"
+
+                    error_text = await response.text()
+                    error_msg = f"{service_name} API returned {response.status}: {error_text}"
+
+                    if response.status == 429:
+                        try:
+                            delay = float(response.headers.get("Retry-After", 1))
+                        except (TypeError, ValueError):
+                            delay = 1.0
+                        delay = min(delay, RETRY_MAX_SLEEP_SECONDS)
+                    elif response.status >= 500:
+                        delay = min(RETRY_MAX_SLEEP_SECONDS, RETRY_BASE_SECONDS * 2 ** attempt)
+                        delay += random.uniform(0, 0.25)
                     else:
-                        error_text = await response.text()
-                        error_msg = f"{service_name} API returned {response.status}: {error_text}"
+                        # 4xx other than 429 won't get better by retrying
                         logger.error(error_msg)
                         return False, error_msg
-        except aiohttp.ClientError as e:
-            error_msg = f"Failed to connect to {service_name}: {str(e)}"
-            logger.error(error_msg)
-            return False, error_msg
-        except Exception as e:
-            error_msg = f"Failed to send {service_name} notification: {str(e)}"
-            logger.error(error_msg)
-            return False, error_msg
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error_msg = f"Failed to connect to {service_name}: {str(e)}"
+                delay = min(RETRY_MAX_SLEEP_SECONDS, RETRY_BASE_SECONDS * 2 ** attempt)
+                delay += random.uniform(0, 0.25)
+            except Exception as e:
+                error_msg = f"Failed to send {service_name} notification: {str(e)}"
+                logger.error(error_msg)
+                return False, error_msg
+
+            if attempt < RETRY_ATTEMPTS - 1:
+                logger.warning(f"{error_msg}; retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+        logger.error(error_msg)
+        return False, error_msg
 
 
 # Convenience functions for backwards compatibility
@@ -8,9 +8,11 @@ with async support.
 from datetime import datetime
 from typing import Optional, List
 from sqlalchemy import (
-    String, Text, Boolean, Integer, BigInteger, DateTime, 
-    ForeignKey, UniqueConstraint, Index, Numeric, JSON
+    String, Text, Boolean, Integer, BigInteger, DateTime,
+    ForeignKey, UniqueConstraint, CheckConstraint, Index, LargeBinary, text,
+    DDL, event, Enum as SqlEnum, Float
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -46,8 +48,10 @@ class User(Base):
     __tablename__ = "users"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
-    username: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    # Uniqueness is enforced case-insensitively by the functional
+    # indexes in __table_args__, not by column-level unique=True
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
+    username: Mapped[str] = mapped_column(String(100), nullable=False)
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     is_admin: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -59,18 +63,37 @@ class User(Base):
     )
     last_login_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    # Relationships
-    webhooks: Mapped[List["UserWebhook"]] = relationship(back_populates="user", cascade="all, delete-orphan")
-    plan_subscriptions: Mapped[List["UserPlanSubscription"]] = relationship(back_populates="user", cascade="all, delete-orphan")
-    group_memberships: Mapped[List["UserGroup"]] = relationship(back_populates="user", cascade="all, delete-orphan")
-    refresh_tokens: Mapped[List["RefreshToken"]] = relationship(back_populates="user", cascade="all, delete-orphan")
-    api_keys: Mapped[List["ApiKey"]] = relationship(back_populates="user", cascade="all, delete-orphan")
-    created_groups: Mapped[List["Group"]] = relationship(back_populates="created_by_user")
-    notification_history: Mapped[List["UserNotificationHistory"]] = relationship(back_populates="user")
+    # Relationships. lazy="raise_on_sql" because every query path here
+    # selects columns or eager-loads explicitly; an implicit lazy load
+    # would be an N+1 regression, so make it fail loudly instead
+    webhooks: Mapped[List["UserWebhook"]] = relationship(
+        back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
+    plan_subscriptions: Mapped[List["UserPlanSubscription"]] = relationship(
+        back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
+    group_memberships: Mapped[List["UserGroup"]] = relationship(
+        back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
+    refresh_tokens: Mapped[List["RefreshToken"]] = relationship(
+        back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
+    api_keys: Mapped[List["ApiKey"]] = relationship(
+        back_populates="user", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
+    created_groups: Mapped[List["Group"]] = relationship(
+        back_populates="created_by_user", lazy="raise_on_sql"
+    )
+    notification_history: Mapped[List["UserNotificationHistory"]] = relationship(
+        back_populates="user", lazy="raise_on_sql"
+    )
 
     __table_args__ = (
-        Index("idx_users_email", "email"),
-        Index("idx_users_username", "username"),
+        # Case-insensitive unique lookups: login compares lower(email) /
+        # lower(username), which a plain case-sensitive index cannot serve,
+        # and this also blocks duplicate accounts differing only in case
+        Index("uq_users_lower_email", text("lower(email)"), unique=True),
+        Index("uq_users_lower_username", text("lower(username)"), unique=True),
     )
 
 
@@ -80,17 +103,26 @@ class RefreshToken(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    token_hash: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    # Raw keyed-BLAKE2b digest; fixed 32-byte binary halves the unique
+    # index entry size versus the old 64-char hex varchar
+    token_hash: Mapped[bytes] = mapped_column(LargeBinary(32), unique=True, nullable=False)
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     revoked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Relationships
-    user: Mapped["User"] = relationship(back_populates="refresh_tokens")
+    user: Mapped["User"] = relationship(back_populates="refresh_tokens", lazy="raise_on_sql")
 
     __table_args__ = (
-        Index("idx_refresh_tokens_user_id", "user_id"),
-        Index("idx_refresh_tokens_expires", "expires_at"),
+        # Covers "sessions for user" and "revoke all for user" in one
+        # index-only scan instead of a user_id probe plus heap fetches
+        Index("idx_refresh_tokens_user_active", "user_id", "expires_at", "revoked_at"),
+        # The expiry sweep only ever looks at unrevoked tokens
+        Index(
+            "idx_refresh_tokens_active",
+            "expires_at",
+            postgresql_where=text("revoked_at IS NULL"),
+        ),
     )
 
 
@@ -100,7 +132,8 @@ class ApiKey(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    key_hash: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    # Raw keyed-BLAKE2b digest (see RefreshToken.token_hash)
+    key_hash: Mapped[bytes] = mapped_column(LargeBinary(32), unique=True, nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     last_used_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -108,7 +141,7 @@ class ApiKey(Base):
     revoked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     # Relationships
-    user: Mapped["User"] = relationship(back_populates="api_keys")
+    user: Mapped["User"] = relationship(back_populates="api_keys", lazy="raise_on_sql")
 
     __table_args__ = (
         Index("idx_api_keys_user_id", "user_id"),
@@ -136,12 +169,18 @@ class Group(Base):
         onupdate=func.now()
     )
 
-    # Relationships
-    created_by_user: Mapped[Optional["User"]] = relationship(back_populates="created_groups")
-    members: Mapped[List["UserGroup"]] = relationship(back_populates="group", cascade="all, delete-orphan")
-    webhooks: Mapped[List["GroupWebhook"]] = relationship(back_populates="group", cascade="all, delete-orphan")
+    # Relationships (lazy="raise_on_sql": see User)
+    created_by_user: Mapped[Optional["User"]] = relationship(
+        back_populates="created_groups", lazy="raise_on_sql"
+    )
+    members: Mapped[List["UserGroup"]] = relationship(
+        back_populates="group", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
+    webhooks: Mapped[List["GroupWebhook"]] = relationship(
+        back_populates="group", cascade="all, delete-orphan", lazy="raise_on_sql"
+    )
     plan_subscriptions: Mapped[List["GroupPlanSubscription"]] = relationship(
-        back_populates="group", cascade="all, delete-orphan"
+        back_populates="group", cascade="all, delete-orphan", lazy="raise_on_sql"
     )
 
 
@@ -152,12 +191,15 @@ class UserGroup(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     group_id: Mapped[int] = mapped_column(ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
-    role: Mapped[str] = mapped_column(String(50), default="member")  # 'owner', 'admin', 'member'
+    # Native PG enum: 4-byte storage and integer comparison instead of varchar
+    role: Mapped[str] = mapped_column(
+        SqlEnum("owner", "admin", "member", name="group_role"), default="member"
+    )
     joined_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    user: Mapped["User"] = relationship(back_populates="group_memberships")
-    group: Mapped["Group"] = relationship(back_populates="members")
+    user: Mapped["User"] = relationship(back_populates="group_memberships", lazy="raise_on_sql")
+    group: Mapped["Group"] = relationship(back_populates="members", lazy="raise_on_sql")
 
     __table_args__ = (
         UniqueConstraint("user_id", "group_id"),
@@ -170,12 +212,26 @@ class UserGroup(Base):
 # WEBHOOKS
 # =============================================================================
 
-class UserWebhook(Base):
-    """User webhooks (Discord and Slack) with customization options."""
-    __tablename__ = "user_webhooks"
+class Webhook(Base):
+    """Single table for user and group webhooks.
+
+    The two owner kinds are near-identical apart from the owning FK, so
+    they share one table via single-table inheritance: owner_type is the
+    polymorphic discriminator, and a check constraint ensures exactly one
+    of user_id/group_id is set to match it. One table means notification
+    fanout can read all targets in one indexed scan instead of a UNION,
+    and there is half the DDL to maintain.
+    """
+    __tablename__ = "webhooks"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    owner_type: Mapped[str] = mapped_column(String(10), nullable=False)
+    user_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=True
+    )
+    group_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("groups.id", ondelete="CASCADE"), nullable=True
+    )
     webhook_url: Mapped[str] = mapped_column(Text, nullable=False)
     webhook_name: Mapped[str] = mapped_column(String(255), default="My Webhook")
     webhook_type: Mapped[str] = mapped_column(String(20), default="discord")  # discord, slack
@@ -187,50 +243,43 @@ class UserWebhook(Base):
     embed_color: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
     slack_channel: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)  # Slack channel override
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # SSRF check result recorded at registration time so send paths
+    # don't have to re-resolve the URL on every notification
+    validated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    resolved_ip: Mapped[Optional[str]] = mapped_column(String(45), nullable=True)  # IPv4 or IPv6 text form
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), 
+        DateTime(timezone=True),
         server_default=func.now(),
         onupdate=func.now()
     )
 
-    # Relationships
-    user: Mapped["User"] = relationship(back_populates="webhooks")
+    __mapper_args__ = {"polymorphic_on": owner_type}
 
     __table_args__ = (
-        Index("idx_user_webhooks_user_id", "user_id"),
-        Index("idx_user_webhooks_type", "webhook_type"),
+        CheckConstraint(
+            "(owner_type = 'user' AND user_id IS NOT NULL AND group_id IS NULL) "
+            "OR (owner_type = 'group' AND group_id IS NOT NULL AND user_id IS NULL)",
+            name="ck_webhooks_owner"
+        ),
+        Index("idx_webhooks_user_id", "user_id"),
+        Index("idx_webhooks_group_id", "group_id"),
+        Index("idx_webhooks_type", "webhook_type"),
     )
 
 
-class GroupWebhook(Base):
-    """Group Discord webhooks (shared webhooks for a group)."""
-    __tablename__ = "group_webhooks"
+class UserWebhook(Webhook):
+    """A webhook owned by a single user."""
+    __mapper_args__ = {"polymorphic_identity": "user"}
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    group_id: Mapped[int] = mapped_column(ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
-    webhook_url: Mapped[str] = mapped_column(Text, nullable=False)
-    webhook_name: Mapped[str] = mapped_column(String(255), default="Group Discord")
-    bot_username: Mapped[Optional[str]] = mapped_column(String(80), nullable=True)
-    avatar_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    include_price: Mapped[bool] = mapped_column(Boolean, default=True)
-    include_specs: Mapped[bool] = mapped_column(Boolean, default=True)
-    mention_role_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
-    embed_color: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
-    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), 
-        server_default=func.now(),
-        onupdate=func.now()
-    )
+    user: Mapped["User"] = relationship(back_populates="webhooks", lazy="raise_on_sql")
 
-    # Relationships
-    group: Mapped["Group"] = relationship(back_populates="webhooks")
 
-    __table_args__ = (
-        Index("idx_group_webhooks_group_id", "group_id"),
-    )
+class GroupWebhook(Webhook):
+    """A webhook shared by all members of a group."""
+    __mapper_args__ = {"polymorphic_identity": "group"}
+
+    group: Mapped["Group"] = relationship(back_populates="webhooks", lazy="raise_on_sql")
 
 
 # =============================================================================
@@ -249,13 +298,15 @@ class UserPlanSubscription(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    user: Mapped["User"] = relationship(back_populates="plan_subscriptions")
+    user: Mapped["User"] = relationship(back_populates="plan_subscriptions", lazy="raise_on_sql")
 
     __table_args__ = (
         UniqueConstraint("user_id", "plan_code", "subsidiary"),
         Index("idx_user_plan_subs_user_id", "user_id"),
-        Index("idx_user_plan_subs_plan_code", "plan_code"),
-        Index("idx_user_plan_subs_subsidiary", "subsidiary"),
+        # Covering index for the fanout query "who wants plan X in
+        # subsidiary Y": trailing user_id makes it index-only
+        Index("idx_ups_plan_sub_notify",
+              "plan_code", "subsidiary", "notify_on_available", "user_id"),
     )
 
 
@@ -271,12 +322,14 @@ class GroupPlanSubscription(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    group: Mapped["Group"] = relationship(back_populates="plan_subscriptions")
+    group: Mapped["Group"] = relationship(back_populates="plan_subscriptions", lazy="raise_on_sql")
 
     __table_args__ = (
         UniqueConstraint("group_id", "plan_code", "subsidiary"),
         Index("idx_group_plan_subs_group_id", "group_id"),
-        Index("idx_group_plan_subs_subsidiary", "subsidiary"),
+        # See idx_ups_plan_sub_notify on user_plan_subscriptions
+        Index("idx_gps_plan_sub_notify",
+              "plan_code", "subsidiary", "notify_on_available", "group_id"),
     )
 
 
@@ -296,8 +349,10 @@ class DatacenterLocation(Base):
     country_code: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
     flag: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
     region: Mapped[str] = mapped_column(String(50), nullable=False)  # US, EU, CA, APAC
-    latitude: Mapped[Optional[float]] = mapped_column(Numeric(10, 7), nullable=True)
-    longitude: Mapped[Optional[float]] = mapped_column(Numeric(10, 7), nullable=True)
+    # float4 is plenty for city-level coordinates and avoids a Decimal
+    # allocation per row on read
+    latitude: Mapped[Optional[float]] = mapped_column(Float(24), nullable=True)
+    longitude: Mapped[Optional[float]] = mapped_column(Float(24), nullable=True)
 
     __table_args__ = (
         Index("idx_datacenter_locations_subsidiary", "subsidiary"),
@@ -317,7 +372,9 @@ class MonitoredPlan(Base):
     enabled: Mapped[bool] = mapped_column(Boolean, default=True)
     
     # Lifecycle tracking
-    catalog_status: Mapped[str] = mapped_column(String(50), default="active")  # 'active', 'discontinued', 'new'
+    catalog_status: Mapped[str] = mapped_column(
+        SqlEnum("new", "active", "discontinued", name="catalog_status"), default="active"
+    )
     first_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     last_seen_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), 
@@ -329,7 +386,9 @@ class MonitoredPlan(Base):
     # Visibility/orderable status
     is_orderable: Mapped[bool] = mapped_column(Boolean, default=True)
     visibility_tags: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    product_line: Mapped[str] = mapped_column(String(50), default="legacy")  # '2025', 'legacy'
+    product_line: Mapped[str] = mapped_column(
+        SqlEnum("2025", "legacy", name="product_line"), default="legacy"
+    )
     
     # Specs from catalog API
     vcpu: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
@@ -398,26 +457,99 @@ class PlanPricing(Base):
 # =============================================================================
 
 class InventoryStatus(Base):
-    """Inventory status history for each plan/datacenter combo."""
+    """
+    Inventory status history for each plan/datacenter combo.
+
+    Range-partitioned by month on checked_at: the table is append-only
+    time series, so partitioning keeps the working-set indexes small and
+    turns retention into DROP TABLE on old partitions instead of a bulk
+    DELETE. A DEFAULT partition is created alongside the parent so the
+    schema works out of the box; deployments that want true monthly
+    children create them (e.g. inventory_status_y2026m09 FOR VALUES
+    FROM ... TO ...) ahead of time.
+    """
     __tablename__ = "inventory_status"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    plan_code: Mapped[str] = mapped_column(String(255), nullable=False)
-    subsidiary: Mapped[str] = mapped_column(String(10), nullable=False, default="US")
-    datacenter: Mapped[str] = mapped_column(String(100), nullable=False)
+    # Natural composite key: the table is append-only time series, so a
+    # synthetic id would only add a column and a second B-tree to every
+    # insert. The PK index itself serves the per-combo history scans.
+    plan_code: Mapped[str] = mapped_column(String(255), primary_key=True)
+    subsidiary: Mapped[str] = mapped_column(String(10), primary_key=True, default="US")
+    datacenter: Mapped[str] = mapped_column(String(100), primary_key=True)
     datacenter_code: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     is_available: Mapped[bool] = mapped_column(Boolean, nullable=False)
     linux_status: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
-    raw_response: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
-    checked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # JSONB instead of text-typed JSON: binary storage skips re-parsing
+    # on read and keeps the door open for operator/GIN indexing
+    raw_response: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    checked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
 
     __table_args__ = (
-        Index("idx_inventory_status_plan_code", "plan_code"),
-        Index("idx_inventory_status_checked_at", "checked_at"),
+        # Availability dashboards only look at in-stock rows, a small
+        # slice of the append-only history
+        Index(
+            "idx_inventory_available_recent",
+            "plan_code", "subsidiary", "datacenter", "checked_at",
+            postgresql_where=text("is_available = true"),
+        ),
         Index("idx_inventory_status_subsidiary", "subsidiary"),
+        # Append-only rows correlate with physical order, so a BRIN
+        # handles pure time-range filters at a fraction of B-tree size
+        Index(
+            "brin_inventory_checked_at",
+            "checked_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": "32"},
+        ),
+        {"postgresql_partition_by": "RANGE (checked_at)"},
     )
 
 
+# LZ4 TOAST compression for the bulky API payload column; set on the
+# parent before any partition exists so partitions inherit it (PG14+)
+event.listen(
+    InventoryStatus.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE inventory_status "
+        "ALTER COLUMN raw_response SET COMPRESSION lz4"
+    ),
+)
+
+# Partitioned parents reject inserts until at least one partition exists;
+# the DEFAULT partition makes a fresh create_all immediately usable
+event.listen(
+    InventoryStatus.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS inventory_status_default "
+        "PARTITION OF inventory_status DEFAULT"
+    ),
+)
+
+
+class CurrentInventory(Base):
+    """Latest inventory state, one row per plan/subsidiary/datacenter.
+
+    Maintained by UPSERT on every poll flush so notification decisions
+    and the status endpoint are a primary-key fetch instead of a
+    DISTINCT ON scan over the growing inventory_status history.
+    last_changed_at only advances when is_available flips.
+    """
+    __tablename__ = "current_inventory"
+
+    plan_code: Mapped[str] = mapped_column(String(255), primary_key=True)
+    subsidiary: Mapped[str] = mapped_column(String(10), primary_key=True, default="US")
+    datacenter: Mapped[str] = mapped_column(String(100), primary_key=True)
+    datacenter_code: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    is_available: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    linux_status: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    checked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    last_changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
 class OutOfStockTracking(Base):
     """Track when items go out of stock for notification timing."""
     __tablename__ = "out_of_stock_tracking"
@@ -442,24 +574,59 @@ class OutOfStockTracking(Base):
 # =============================================================================
 
 class NotificationHistory(Base):
-    """System default webhook notification history."""
+    """
+    System default webhook notification history.
+
+    Partitioned by month on sent_at for the same reasons as
+    InventoryStatus (append-only growth, cheap retention).
+    """
     __tablename__ = "notification_history"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    plan_code: Mapped[str] = mapped_column(String(255), nullable=False)
-    subsidiary: Mapped[str] = mapped_column(String(10), nullable=False, default="US")
-    datacenter: Mapped[str] = mapped_column(String(100), nullable=False)
+    # Natural composite key, same rationale as InventoryStatus
+    plan_code: Mapped[str] = mapped_column(String(255), primary_key=True)
+    subsidiary: Mapped[str] = mapped_column(String(10), primary_key=True, default="US")
+    datacenter: Mapped[str] = mapped_column(String(100), primary_key=True)
     message: Mapped[str] = mapped_column(Text, nullable=False)
-    sent_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    sent_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
     success: Mapped[bool] = mapped_column(Boolean, nullable=False)
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     is_default_webhook: Mapped[bool] = mapped_column(Boolean, default=True)
 
     __table_args__ = (
         Index("idx_notification_history_subsidiary", "subsidiary"),
+        # See brin_inventory_checked_at
+        Index(
+            "brin_notification_sent_at",
+            "sent_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": "32"},
+        ),
+        {"postgresql_partition_by": "RANGE (sent_at)"},
     )
 
 
+# See inventory_status: LZ4-compress the repetitive template text
+event.listen(
+    NotificationHistory.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE notification_history "
+        "ALTER COLUMN message SET COMPRESSION lz4"
+    ),
+)
+
+event.listen(
+    NotificationHistory.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS notification_history_default "
+        "PARTITION OF notification_history DEFAULT"
+    ),
+)
+
+
 class UserNotificationHistory(Base):
     """User-specific notification history."""
     __tablename__ = "user_notification_history"
@@ -469,7 +636,7 @@ class UserNotificationHistory(Base):
         ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
     webhook_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("user_webhooks.id", ondelete="SET NULL"), nullable=True
+        ForeignKey("webhooks.id", ondelete="SET NULL"), nullable=True
     )
     plan_code: Mapped[str] = mapped_column(String(255), nullable=False)
     datacenter: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -480,9 +647,16 @@ class UserNotificationHistory(Base):
     is_default_webhook: Mapped[bool] = mapped_column(Boolean, default=False)
 
     # Relationships
-    user: Mapped[Optional["User"]] = relationship(back_populates="notification_history")
+    user: Mapped[Optional["User"]] = relationship(back_populates="notification_history", lazy="raise_on_sql")
 
     __table_args__ = (
+        # B-tree stays on user_id where equality lookups dominate
         Index("idx_user_notif_history_user_id", "user_id"),
-        Index("idx_user_notif_history_sent_at", "sent_at"),
+        # See brin_inventory_checked_at
+        Index(
+            "brin_user_notif_sent_at",
+            "sent_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": "32"},
+        ),
     )